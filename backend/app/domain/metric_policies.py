@@ -63,7 +63,10 @@ METRIC_POLICIES: Dict[str, MetricPolicy] = {
 
 
 def get_metric_policy(metric_key: str) -> MetricPolicy:
-    if metric_key not in METRIC_POLICIES:
+    # Policies are static module data, so this is already a single dict lookup;
+    # no memoization layer is needed on top.
+    policy = METRIC_POLICIES.get(metric_key)
+    if policy is None:
         raise ValueError(f"No policy defined for metric: {metric_key}")
-    return METRIC_POLICIES[metric_key]
+    return policy
 
@@ -1,5 +1,5 @@
 """Legacy HealthDataPoint model - kept for backward compatibility"""
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.dialects.postgresql import JSONB
 from datetime import datetime
 from app.core.database import Base
@@ -21,3 +21,14 @@ class HealthDataPoint(Base):
     quality_score = Column(JSONB, nullable=True)  # Full quality score breakdown
     is_flagged = Column(Boolean, nullable=False, default=False)  # Quality score < 0.6
 
+    __table_args__ = (
+        # Recent-window reads filter on (user_id, metric_type) and range/order by timestamp;
+        # value and source are included so those reads can be index-only on Postgres
+        Index(
+            "ix_health_data_user_metric_ts",
+            "user_id",
+            "metric_type",
+            "timestamp",
+            postgresql_include=["value", "source"],
+        ),
+    )
@@ -43,6 +43,7 @@ class NotificationOutbox(Base):
 
     __table_args__ = (
         Index("ix_outbox_user_channel_state", "user_id", "channel", "is_dispatched"),
-        Index("ix_outbox_dedupe", "dedupe_key"),
+        # Unique so enqueue can dedupe with INSERT ... ON CONFLICT (NULL keys never collide)
+        Index("ix_outbox_dedupe", "dedupe_key", unique=True),
     )
 
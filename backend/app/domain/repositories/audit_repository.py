@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
@@ -33,9 +34,56 @@ class AuditRepository:
         metadata: Optional[Dict[str, Any]] = None,
     ) -> AuditEvent:
         """Create an audit event."""
-        import json
-        
-        event = AuditEvent(
+        event = AuditEvent(**self._row(
+            user_id=user_id,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            decision_type=decision_type,
+            decision_reason=decision_reason,
+            source_metrics=source_metrics,
+            time_windows=time_windows,
+            detectors_used=detectors_used,
+            thresholds_crossed=thresholds_crossed,
+            safety_checks_applied=safety_checks_applied,
+            metadata=metadata,
+        ))
+        self.db.add(event)
+        self.db.commit()
+        self.db.refresh(event)
+        return event
+
+    def bulk_create(self, events: List[Dict[str, Any]], *, commit: bool = True) -> int:
+        """
+        Create many audit events in a single INSERT batch and commit.
+
+        Each item takes the same keyword arguments as create(). Rows are written
+        with bulk_insert_mappings, so no AuditEvent instances are returned.
+        With commit=False the rows are only flushed and the caller commits.
+        """
+        if not events:
+            return 0
+        self.db.bulk_insert_mappings(AuditEvent, [self._row(**kwargs) for kwargs in events])
+        if commit:
+            self.db.commit()
+        return len(events)
+
+    @staticmethod
+    def _row(
+        *,
+        user_id: int,
+        entity_type: str,
+        entity_id: int,
+        decision_type: str,
+        decision_reason: Optional[str] = None,
+        source_metrics: Optional[List[str]] = None,
+        time_windows: Optional[Dict[str, Dict[str, Any]]] = None,
+        detectors_used: Optional[List[str]] = None,
+        thresholds_crossed: Optional[List[Dict[str, Any]]] = None,
+        safety_checks_applied: Optional[List[Dict[str, Any]]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Column values for an audit event (JSON fields serialized)."""
+        return dict(
             user_id=user_id,
             entity_type=entity_type,
             entity_id=entity_id,
@@ -48,10 +96,6 @@ class AuditRepository:
             safety_checks_applied=json.dumps(safety_checks_applied) if safety_checks_applied else None,
             metadata_json=json.dumps(metadata) if metadata else None,
         )
-        self.db.add(event)
-        self.db.commit()
-        self.db.refresh(event)
-        return event
     
     def list_for_entity(
         self,
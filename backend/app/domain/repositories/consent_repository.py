@@ -78,7 +78,15 @@ class ConsentRepository:
         
         WEEK 2: Returns False if consent is revoked or provider-specific consent not granted.
         """
-        consent = self.get_latest(user_id)
+        return self.consent_allows(self.get_latest(user_id), provider=provider)
+
+    @staticmethod
+    def consent_allows(consent: Optional[Consent], provider: Optional[str] = None) -> bool:
+        """
+        Same check as is_consent_valid, on an already-loaded consent record.
+        
+        Lets callers that also need the record (e.g. to explain a refusal) load it once.
+        """
         if not consent:
             return False
         
@@ -1,5 +1,5 @@
 from datetime import date
-from typing import Optional
+from typing import Iterable, List, Optional, Set
 
 from sqlalchemy.orm import Session
 
@@ -47,3 +47,25 @@ class DailyCheckInRepository:
             .all()
         )
 
+    def list_notes_range(self, user_id: int, start_date: date, end_date: date) -> List[str]:
+        """Non-empty check-in notes in the date range, without loading the other columns."""
+        rows = (
+            self.db.query(DailyCheckIn.notes)
+            .filter(DailyCheckIn.user_id == user_id)
+            .filter(DailyCheckIn.checkin_date >= start_date, DailyCheckIn.checkin_date <= end_date)
+            .filter(DailyCheckIn.notes.isnot(None), DailyCheckIn.notes != "")
+            .all()
+        )
+        return [notes for (notes,) in rows]
+
+    def user_ids_with_checkin(self, user_ids: Iterable[int], checkin_date: date) -> Set[int]:
+        """Subset of user_ids that already have a check-in for checkin_date (one query)."""
+        user_ids = list(user_ids)
+        if not user_ids:
+            return set()
+        rows = (
+            self.db.query(DailyCheckIn.user_id)
+            .filter(DailyCheckIn.user_id.in_(user_ids), DailyCheckIn.checkin_date == checkin_date)
+            .all()
+        )
+        return {user_id for (user_id,) in rows}
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
 
@@ -34,6 +34,16 @@ class ExplanationRepository:
         self.db.refresh(edge)
         return edge
 
+    def bulk_create(self, edges: List[Dict[str, Any]], *, commit: bool = True) -> int:
+        """Create many explanation edges (create_edge kwargs) in one INSERT batch and commit (unless commit=False)"""
+        if not edges:
+            return 0
+        rows = [{"contribution_weight": 1.0, "description": None, **kwargs} for kwargs in edges]
+        self.db.bulk_insert_mappings(ExplanationEdge, rows)
+        if commit:
+            self.db.commit()
+        return len(rows)
+
     def get_for_target(
         self,
         target_type: str,
@@ -24,6 +24,32 @@ class InboxRepository:
         self.db.refresh(item)
         return item
 
+    def bulk_create(self, items: List[Dict[str, Any]]) -> int:
+        """
+        Create many inbox items in a single INSERT batch and commit.
+
+        Each item takes the same keyword arguments as create(). Rows are written
+        with bulk_insert_mappings, so no InboxItem instances are returned.
+        """
+        if not items:
+            return 0
+        self.db.bulk_insert_mappings(
+            InboxItem,
+            [
+                dict(
+                    user_id=item["user_id"],
+                    category=item["category"],
+                    title=item["title"],
+                    body=item["body"],
+                    metadata_json=item.get("metadata") or None,
+                    is_read=False,
+                )
+                for item in items
+            ],
+        )
+        self.db.commit()
+        return len(items)
+
     def list_by_user(self, user_id: int, limit: int = 50, unread_only: bool = False) -> List[InboxItem]:
         q = self.db.query(InboxItem).filter(InboxItem.user_id == user_id)
         if unread_only:
@@ -1,7 +1,8 @@
-from typing import Optional, List
+from typing import Any, Dict, List, Optional, Union
 from sqlalchemy.orm import Session
 from app.domain.models.insight import Insight
 from app.core.invariants import validate_insight_invariants, InvariantViolation
+from app.utils import json_codec
 
 
 class InsightRepository:
@@ -9,6 +10,7 @@ class InsightRepository:
 
     def __init__(self, db: Session) -> None:
         self.db = db
+        self._pending: List[Insight] = []
 
     def create(
         self,
@@ -18,7 +20,86 @@ class InsightRepository:
         title: str,
         description: str,
         confidence_score: float,
-        metadata_json: str = "",
+        metadata_json: Union[str, Dict[str, Any]] = "",
+    ) -> Insight:
+        insight = self._build(
+            user_id=user_id,
+            insight_type=insight_type,
+            title=title,
+            description=description,
+            confidence_score=confidence_score,
+            metadata_json=metadata_json,
+        )
+        self.db.add(insight)
+        self.db.commit()
+        self.db.refresh(insight)
+        return insight
+
+    def bulk_create(self, rows: List[Dict[str, Any]]) -> List[Insight]:
+        """
+        Create many insights in a single flush + commit and return them.
+
+        Each row takes the same keyword arguments as create(). Every row is
+        validated before anything is written, so one invalid row blocks the batch.
+        """
+        insights = [self._build(**row) for row in rows]
+        if not insights:
+            return []
+        self.db.add_all(insights)
+        self.db.commit()
+        return insights
+
+    def stage(
+        self,
+        *,
+        user_id: int,
+        insight_type: str,
+        title: str,
+        description: str,
+        confidence_score: float,
+        metadata_json: Union[str, Dict[str, Any]] = "",
+    ) -> Insight:
+        """
+        Validate and queue an Insight without touching the database.
+
+        Staged insights are persisted together by flush_all(); their ids are
+        only available after that call.
+        """
+        insight = self._build(
+            user_id=user_id,
+            insight_type=insight_type,
+            title=title,
+            description=description,
+            confidence_score=confidence_score,
+            metadata_json=metadata_json,
+        )
+        self._pending.append(insight)
+        return insight
+
+    def flush_all(self) -> List[Insight]:
+        """
+        Flush all staged insights in a single batch and return them.
+
+        The insights get their ids but are not committed. The caller commits
+        once it has written the rows that reference them. Committing here would
+        expire the instances, so every later ins.id read would cost a SELECT.
+        """
+        pending, self._pending = self._pending, []
+        if not pending:
+            return []
+        self.db.add_all(pending)
+        self.db.flush()
+        return pending
+
+    def _build(
+        self,
+        *,
+        user_id: int,
+        insight_type: str,
+        title: str,
+        description: str,
+        confidence_score: float,
+        metadata_json: Union[str, Dict[str, Any]],
     ) -> Insight:
         # X1: Validate invariants before creation
         try:
@@ -33,18 +114,20 @@ class InsightRepository:
         except InvariantViolation as e:
             # Hard-fail: skip object creation and surface safe fallback message
             raise ValueError(f"Insight creation blocked: {e.message}")
-        
+
+        # metadata may be passed as a dict: serialize it exactly once here and keep the
+        # dict on the instance (_metadata) so callers don't have to json.loads it back.
+        metadata = metadata_json if isinstance(metadata_json, dict) else None
         insight = Insight(
             user_id=user_id,
             insight_type=insight_type,
             title=title,
             description=description,
             confidence_score=confidence_score,
-            metadata_json=metadata_json,
+            metadata_json=json_codec.dumps(metadata) if metadata is not None else metadata_json,
         )
-        self.db.add(insight)
-        self.db.commit()
-        self.db.refresh(insight)
+        if metadata is not None:
+            insight._metadata = metadata
         return insight
 
     def list_for_user(
@@ -1,12 +1,20 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Dict, Iterable, Optional, List, Set, Tuple
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import postgresql, sqlite
 
 from app.domain.models.notification_outbox import NotificationOutbox
+from app.utils import json_codec
+
+# Dialects whose INSERT supports ON CONFLICT DO NOTHING against the unique dedupe_key index
+_UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
 
 
 class NotificationOutboxRepository:
@@ -21,6 +29,18 @@ class NotificationOutboxRepository:
             is not None
         )
 
+    def existing_dedupe_keys(self, dedupe_keys: Iterable[Optional[str]]) -> Set[str]:
+        """Subset of dedupe_keys already present in the outbox (one query; empty keys ignored)."""
+        keys = {key for key in dedupe_keys if key}
+        if not keys:
+            return set()
+        rows = (
+            self.db.query(NotificationOutbox.dedupe_key)
+            .filter(NotificationOutbox.dedupe_key.in_(keys))
+            .all()
+        )
+        return {key for (key,) in rows}
+
     def enqueue(
         self,
         user_id: int,
@@ -28,16 +48,132 @@ class NotificationOutboxRepository:
         notification_type: str,
         payload_json: Optional[str] = None,
         dedupe_key: Optional[str] = None,
+        payload: Optional[Dict[str, Any]] = None,
     ) -> NotificationOutbox:
-        if dedupe_key and self.exists_by_dedupe_key(dedupe_key):
-            # Dedupe: return existing row to keep behavior idempotent
-            return (
-                self.db.query(NotificationOutbox)
-                .filter(NotificationOutbox.dedupe_key == dedupe_key)
-                .first()
-            )
-
-        row = NotificationOutbox(
+        """
+        Queue a notification for dispatch.
+
+        Pass either a pre-serialized payload_json or a payload dict. The row is
+        written with the same INSERT ... ON CONFLICT (dedupe_key) DO NOTHING
+        statement as bulk_enqueue(). When the dedupe_key already exists, the
+        existing row is returned instead. Nothing is committed.
+        """
+        row = self._row(
+            user_id=user_id,
+            channel=channel,
+            notification_type=notification_type,
+            payload_json=payload_json,
+            dedupe_key=dedupe_key,
+            payload=payload,
+        )
+        inserted = self._insert_new([row], NotificationOutbox)
+        if inserted:
+            return inserted[0][0]
+        # Dedupe: return existing row to keep behavior idempotent
+        return (
+            self.db.query(NotificationOutbox)
+            .filter(NotificationOutbox.dedupe_key == dedupe_key)
+            .first()
+        )
+
+    def enqueue_if_new(
+        self,
+        user_id: int,
+        channel: str,
+        notification_type: str,
+        payload_json: Optional[str] = None,
+        dedupe_key: Optional[str] = None,
+        payload: Optional[Dict[str, Any]] = None,
+    ) -> Optional[int]:
+        """
+        Queue a notification unless its dedupe_key is already in the outbox.
+
+        Same arguments as enqueue(). Returns the new row id, or None when the key
+        already exists. Nothing is committed.
+        """
+        row = self._row(
+            user_id=user_id,
+            channel=channel,
+            notification_type=notification_type,
+            payload_json=payload_json,
+            dedupe_key=dedupe_key,
+            payload=payload,
+        )
+        inserted = self._insert_new([row], NotificationOutbox.id)
+        return inserted[0][0] if inserted else None
+
+    def bulk_enqueue(self, rows: List[Dict[str, Any]]) -> List[Tuple[int, Optional[str]]]:
+        """
+        Queue many notifications in a single INSERT batch.
+
+        Each row takes the same keyword arguments as enqueue(). Rows whose
+        dedupe_key is already in the outbox are skipped. Returns a
+        (user_id, dedupe_key) pair for every row that was written. Like
+        enqueue(), nothing is committed.
+        """
+        if not rows:
+            return []
+        inserted = self._insert_new(
+            [self._row(**row) for row in rows],
+            NotificationOutbox.user_id,
+            NotificationOutbox.dedupe_key,
+        )
+        return [(user_id, dedupe_key) for user_id, dedupe_key in inserted]
+
+    def _insert_new(self, rows: List[Dict[str, Any]], *returning) -> List[Any]:
+        """
+        INSERT rows, skipping any whose dedupe_key already exists, and return the
+        `returning` columns (or the NotificationOutbox entity) of the rows actually written.
+
+        On dialects that support it, this is one
+        INSERT ... ON CONFLICT (dedupe_key) DO NOTHING RETURNING statement. There is
+        no separate existence probe and no window for concurrent duplicates.
+        Rows without a dedupe_key never conflict (NULLs are distinct).
+        """
+        dialect_insert = _UPSERT_INSERTS.get(self.db.get_bind().dialect.name)
+        if dialect_insert is None:
+            return self._insert_new_fallback(rows, returning)
+        stmt = dialect_insert(NotificationOutbox).on_conflict_do_nothing(index_elements=["dedupe_key"])
+        return self.db.execute(stmt.returning(*returning), rows).all()
+
+    def _insert_new_fallback(self, rows: List[Dict[str, Any]], returning: tuple) -> List[Any]:
+        """
+        _insert_new() for dialects without ON CONFLICT / RETURNING support.
+
+        Known keys are probed in one query. Each remaining row is then inserted in its
+        own SAVEPOINT, so a key written concurrently since the probe skips just that
+        row (IntegrityError on the unique index) instead of failing the batch.
+        """
+        seen = self.existing_dedupe_keys(row["dedupe_key"] for row in rows)
+        written = []
+        for row in rows:
+            dedupe_key = row["dedupe_key"]
+            if dedupe_key in seen:
+                continue
+            obj = NotificationOutbox(**row)
+            try:
+                with self.db.begin_nested():
+                    self.db.add(obj)
+            except IntegrityError:
+                continue
+            if dedupe_key:
+                seen.add(dedupe_key)
+            written.append(tuple(obj if col is NotificationOutbox else getattr(obj, col.key) for col in returning))
+        return written
+
+    @staticmethod
+    def _row(
+        *,
+        user_id: int,
+        channel: str,
+        notification_type: str,
+        payload_json: Optional[str] = None,
+        dedupe_key: Optional[str] = None,
+        payload: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        if payload is not None:
+            payload_json = json_codec.dumps(payload)
+        return dict(
             user_id=user_id,
             channel=channel,
             notification_type=notification_type,
@@ -46,9 +182,6 @@ class NotificationOutboxRepository:
             is_dispatched=False,
             attempt_count=0,
         )
-        self.db.add(row)
-        self.db.flush()
-        return row
 
     def list_pending(self, limit: int = 100) -> List[NotificationOutbox]:
         return (
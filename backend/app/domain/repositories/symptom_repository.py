@@ -52,6 +52,27 @@ class SymptomRepository:
             .all()
         )
 
+    def list_recent_names(
+        self,
+        user_id: int,
+        days: int = 30,
+    ) -> List[str]:
+        """Distinct symptom names logged in the last N days (no full rows loaded)."""
+        from datetime import timedelta
+
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        rows = (
+            self.db.query(Symptom.symptom_name)
+            .filter(
+                Symptom.user_id == user_id,
+                Symptom.timestamp >= cutoff,
+                Symptom.symptom_name.isnot(None),
+            )
+            .distinct()
+            .all()
+        )
+        return [name for (name,) in rows if name]
+
     def list_by_name(
         self,
         user_id: int,
@@ -90,6 +90,11 @@ RED_FLAG_RULES: List[RedFlagRule] = [
     ),
 ]
 
+# Metric keys read from latest_metrics by metric/lab rules; callers only need to aggregate these.
+RED_FLAG_METRIC_KEYS = frozenset(
+    rule.metric_key for rule in RED_FLAG_RULES if rule.kind in ("metric", "lab") and rule.metric_key
+)
+
 
 def _compare(condition: str, value: Any, threshold: Any) -> bool:
     if value is None:
@@ -1,6 +1,6 @@
+import math
 from dataclasses import dataclass
 from typing import Optional
-from statistics import pstdev
 
 
 @dataclass
@@ -14,6 +14,14 @@ class InstabilityResult:
     strength: str  # "moderate" | "strong"
 
 
+def _population_std(values: list[float]) -> float:
+    # Float equivalent of statistics.pstdev (which uses exact Fraction arithmetic and is
+    # far slower); fsum keeps the sums accurately rounded.
+    n = len(values)
+    mean = math.fsum(values) / n
+    return math.sqrt(math.fsum((v - mean) * (v - mean) for v in values) / n)
+
+
 def detect_instability(
     *,
     metric_key: str,
@@ -27,8 +35,11 @@ def detect_instability(
         return None
     if baseline_std <= 0.00001:
         return None
+    if ratio_threshold > 0 and min(values) == max(values):
+        # Flat window: recent_std is 0, so the ratio can never reach the threshold.
+        return None
 
-    recent_std = pstdev(values) if len(values) > 1 else 0.0
+    recent_std = _population_std(values) if len(values) > 1 else 0.0
     ratio = recent_std / baseline_std
 
     # Use metric-specific threshold
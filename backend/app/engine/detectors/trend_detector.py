@@ -13,14 +13,13 @@ class TrendResult:
 
 
 def _linear_regression_slope(y: list[float]) -> float:
-    # x = 0..n-1
+    # x = 0..n-1, so x_mean and sum((x - x_mean)^2) have closed forms; one pass over y.
     n = len(y)
-    xs = list(range(n))
-    x_mean = sum(xs) / n
+    x_mean = (n - 1) / 2
     y_mean = sum(y) / n
 
-    num = sum((xs[i] - x_mean) * (y[i] - y_mean) for i in range(n))
-    den = sum((xs[i] - x_mean) ** 2 for i in range(n))
+    num = sum((i - x_mean) * (v - y_mean) for i, v in enumerate(y))
+    den = n * (n * n - 1) / 12
     if den == 0:
         return 0.0
     return num / den
@@ -36,6 +35,9 @@ def detect_trend(
 ) -> Optional[TrendResult]:
     if len(values) < min_points:
         return None
+    if slope_threshold > 0 and min(values) == max(values):
+        # Flat window: the slope is 0, so it can never reach the threshold.
+        return None
 
     slope = _linear_regression_slope(values)
 
@@ -48,7 +48,10 @@ def _safe_insight_domain_key(obj: object) -> Optional[HealthDomainKey]:
 
     We only read existing fields; we do not infer probabilistically.
     """
-    meta = getattr(obj, "metadata_json", None)
+    # Prefer the parsed dict loop_runner / InsightRepository keep on the instance.
+    meta = getattr(obj, "_metadata", None)
+    if not isinstance(meta, dict):
+        meta = getattr(obj, "metadata_json", None)
     if meta:
         try:
             if isinstance(meta, str):
@@ -118,40 +121,52 @@ def compute_domain_status(
         signals = HEALTH_DOMAINS[domain_key].signals
 
         # Signals present = at least one data point for any signal in this domain
-        present_rows = (
-            db.query(distinct(HealthDataPoint.metric_type))
-            .filter(
-                HealthDataPoint.user_id == user_id,
-                HealthDataPoint.metric_type.in_(list(signals)),
-            )
-            .all()
-        )
-        present_signals = {r[0] for r in present_rows if r and isinstance(r[0], str)}
+        present_signals = _distinct_metric_types(db, HealthDataPoint, user_id, signals)
 
         if not present_signals:
             return DomainStatus.NO_DATA
 
         # Baseline established = baseline exists for all present signals (conservative)
-        baseline_rows = (
-            db.query(distinct(Baseline.metric_type))
-            .filter(
-                Baseline.user_id == user_id,
-                Baseline.metric_type.in_(list(present_signals)),
-            )
-            .all()
+        baseline_signals = _distinct_metric_types(db, Baseline, user_id, present_signals)
+
+        return _classify_domain(
+            domain_key,
+            present_signals=present_signals,
+            baseline_signals=baseline_signals,
+            surfaced_domains=_domains_from_surfaced_insights(surfaced_insights),
         )
-        baseline_signals = {r[0] for r in baseline_rows if r and isinstance(r[0], str)}
-        missing_baselines = present_signals - baseline_signals
-        if missing_baselines:
-            return DomainStatus.BASELINE_BUILDING
+    except Exception:
+        return DomainStatus.NO_DATA
 
-        surfaced_domains = _domains_from_surfaced_insights(surfaced_insights)
-        if domain_key not in surfaced_domains:
-            return DomainStatus.NO_SIGNAL_DETECTED
 
-        return DomainStatus.SIGNAL_DETECTED
-    except Exception:
+def _distinct_metric_types(db: Session, model, user_id: int, metric_types: Iterable[str]) -> Set[str]:
+    """Distinct metric_type values of model rows for user_id, limited to metric_types."""
+    rows = (
+        db.query(distinct(model.metric_type))
+        .filter(
+            model.user_id == user_id,
+            model.metric_type.in_(list(metric_types)),
+        )
+        .all()
+    )
+    return {r[0] for r in rows if r and isinstance(r[0], str)}
+
+
+def _classify_domain(
+    domain_key: HealthDomainKey,
+    *,
+    present_signals: Set[str],
+    baseline_signals: Set[str],
+    surfaced_domains: Set[HealthDomainKey],
+) -> DomainStatus:
+    """Apply the ordered status rules of compute_domain_status to precomputed inputs."""
+    if not present_signals:
         return DomainStatus.NO_DATA
+    if present_signals - baseline_signals:
+        return DomainStatus.BASELINE_BUILDING
+    if domain_key not in surfaced_domains:
+        return DomainStatus.NO_SIGNAL_DETECTED
+    return DomainStatus.SIGNAL_DETECTED
 
 
 def compute_domain_statuses(
@@ -164,10 +179,26 @@ def compute_domain_statuses(
     Compute statuses for all canonical domains.
 
     Output is keyed by HealthDomainKey (no ranking; stable iteration order).
+
+    Same rules as compute_domain_status, but data presence and baselines are queried
+    once for every domain's signals (2 queries instead of 2 per domain), and surfaced
+    insights are mapped to domains once.
     """
+    try:
+        all_signals = {sig for domain in HEALTH_DOMAINS.values() for sig in domain.signals}
+        present_all = _distinct_metric_types(db, HealthDataPoint, user_id, all_signals)
+        baseline_all = _distinct_metric_types(db, Baseline, user_id, present_all) if present_all else set()
+        surfaced_domains = _domains_from_surfaced_insights(surfaced_insights)
+    except Exception:
+        return {dk: DomainStatus.NO_DATA for dk in HEALTH_DOMAINS.keys()}
+
     out: Dict[HealthDomainKey, DomainStatus] = {}
-    for dk in HEALTH_DOMAINS.keys():
-        out[dk] = compute_domain_status(db, user_id=user_id, domain_key=dk, surfaced_insights=surfaced_insights)
+    for dk, domain in HEALTH_DOMAINS.items():
+        present_signals = present_all.intersection(domain.signals)
+        out[dk] = _classify_domain(
+            dk,
+            present_signals=present_signals,
+            baseline_signals=baseline_all & present_signals,
+            surfaced_domains=surfaced_domains,
+        )
     return out
-
-
@@ -2,15 +2,43 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app.domain.models.decision_signal import DecisionSignal
 from app.domain.models.insight import Insight
+from app.utils import json_codec
 
 logger = logging.getLogger(__name__)
 
 
+def _metric_key_of(insight: object) -> Optional[str]:
+    """
+    metric_key from an insight's metadata.
+
+    Uses the parsed dict kept on the instance (_metadata, set by InsightRepository and
+    loop_runner) when present; otherwise parses metadata_json once and memoizes it there,
+    since the same rows are re-checked for every candidate in a run.
+    """
+    try:
+        meta = getattr(insight, "_metadata", None)
+        if not isinstance(meta, dict):
+            meta = getattr(insight, "metadata_json", None)
+            if isinstance(meta, str) and meta:
+                meta = json_codec.loads(meta)
+                if isinstance(meta, dict):
+                    try:
+                        insight._metadata = meta
+                    except AttributeError:
+                        pass
+        if isinstance(meta, dict):
+            return meta.get("metric_key")
+    except Exception:
+        return None
+    return None
+
+
 class InsightSuppressionService:
     """
     Insight Fatigue & Noise Control
@@ -24,6 +52,7 @@ class InsightSuppressionService:
     MIN_DAYS_BETWEEN_REPEATS = 7  # Don't show same insight within 7 days
     MIN_CONFIDENCE_FOR_REPEAT = 0.7  # Only repeat if confidence >= 0.7
     MAX_DAILY_INSIGHTS = 10  # Cap daily surfaced insights
+    DUPLICATE_SCAN_LIMIT = 50  # Most recent insights scanned for a duplicate metric_key
     
     def __init__(self, db: Session):
         self.db = db
@@ -33,9 +62,13 @@ class InsightSuppressionService:
         user_id: int,
         insight: Insight,
         today: Optional[datetime] = None,
+        recent: Optional[List[Insight]] = None,
     ) -> tuple[bool, Optional[str]]:
         """
         Determine if an insight should be suppressed.
+
+        recent: optional result of recent_insights(user_id, today) shared across the
+        candidates of one run; when omitted the duplicate scan queries on its own.
         
         Returns:
             (should_suppress, reason)
@@ -44,7 +77,7 @@ class InsightSuppressionService:
             today = datetime.utcnow()
         
         # Check for recent duplicate insights
-        recent_duplicate = self._find_recent_duplicate(user_id, insight, today)
+        recent_duplicate = self._find_recent_duplicate(user_id, insight, today, recent)
         if recent_duplicate:
             # Insight model uses generated_at (not created_at)
             dup_ts = getattr(recent_duplicate, "generated_at", None) or getattr(recent_duplicate, "created_at", None)
@@ -68,68 +101,73 @@ class InsightSuppressionService:
         user_id: int,
         insight: Insight,
         today: datetime,
+        recent: Optional[List[Insight]] = None,
     ) -> Optional[Insight]:
         """Find a recent duplicate insight"""
         # Metric key is stored in metadata_json for this model
-        metric_key: Optional[str] = None
-        try:
-            meta = insight.metadata_json
-            if isinstance(meta, dict):
-                metric_key = meta.get("metric_key")
-            elif isinstance(meta, str) and meta:
-                import json
-                metric_key = json.loads(meta).get("metric_key")
-        except Exception:
-            metric_key = None
+        metric_key = _metric_key_of(insight)
         
         if not metric_key:
             return None
         
         # Look for recent insights within window; filter by metric_key in metadata_json (Python-side)
+        if recent is None:
+            candidates = (
+                self._recent_insights_query(user_id, today)
+                .filter(Insight.id != insight.id)  # Exclude self
+                .limit(self.DUPLICATE_SCAN_LIMIT)
+                .all()
+            )
+        else:
+            candidates = [c for c in recent if c.id != insight.id][: self.DUPLICATE_SCAN_LIMIT]
+
+        for cand in candidates:
+            if _metric_key_of(cand) == metric_key:
+                return cand
+        return None
+    
+    def recent_insights(self, user_id: int, today: datetime) -> List[Insight]:
+        """
+        Insights the duplicate check scans for user_id as of today.
+
+        The query does not depend on the insight being checked, so a caller checking
+        several insights against the same state can fetch it once and pass it as
+        should_suppress_insight(recent=...). One extra row covers the self-exclusion.
+        """
+        return self._recent_insights_query(user_id, today).limit(self.DUPLICATE_SCAN_LIMIT + 1).all()
+
+    def _recent_insights_query(self, user_id: int, today: datetime):
         cutoff = today - timedelta(days=self.MIN_DAYS_BETWEEN_REPEATS)
-        
-        candidates = (
+        return (
             self.db.query(Insight)
             .filter(
                 Insight.user_id == user_id,
                 Insight.generated_at >= cutoff,
-                Insight.id != insight.id,  # Exclude self
             )
             .order_by(Insight.generated_at.desc())
-            .limit(50)
-            .all()
         )
-
-        def _extract_metric_key(m: object) -> Optional[str]:
-            try:
-                meta = getattr(m, "metadata_json", None)
-                if isinstance(meta, dict):
-                    return meta.get("metric_key")
-                if isinstance(meta, str) and meta:
-                    import json
-                    return json.loads(meta).get("metric_key")
-            except Exception:
-                return None
-            return None
-
-        for cand in candidates:
-            if _extract_metric_key(cand) == metric_key:
-                return cand
-        return None
     
     def _count_today_insights(self, user_id: int, today: datetime) -> int:
         """Count insights surfaced today"""
+        return self.db.query(Insight).filter(*self._today_filter(user_id, today)).count()
+
+    def count_today_subquery(self, user_id: int, today: datetime):
+        """
+        _count_today_insights() as a scalar subquery.
+
+        A caller that already runs a per-user query can select this as an extra
+        column, so the count needs no round trip of its own.
+        """
+        return select(func.count(Insight.id)).where(*self._today_filter(user_id, today)).scalar_subquery()
+
+    @staticmethod
+    def _today_filter(user_id: int, today: datetime) -> tuple:
         start_of_day = today.replace(hour=0, minute=0, second=0, microsecond=0)
         end_of_day = start_of_day + timedelta(days=1)
-        
         return (
-            self.db.query(Insight)
-            .filter(
-                Insight.user_id == user_id,
-                Insight.generated_at >= start_of_day,
-                Insight.generated_at < end_of_day,
-            )
-            .count()
+            Insight.user_id == user_id,
+            Insight.generated_at >= start_of_day,
+            Insight.generated_at < end_of_day,
         )
     
     def mark_suppressed(
@@ -141,10 +179,39 @@ class InsightSuppressionService:
         suppress_until: Optional[datetime] = None,
     ) -> None:
         """Mark a signal as suppressed"""
+        self.db.add(self._suppression_signal(user_id, source_type, source_id, reason, suppress_until))
+        self.db.commit()
+
+    def mark_suppressed_many(
+        self,
+        user_id: int,
+        source_type: str,
+        entries: List[Tuple[int, str]],
+        suppress_until: Optional[datetime] = None,
+    ) -> None:
+        """Mark several signals as suppressed ((source_id, reason) pairs) with one commit"""
+        if not entries:
+            return
+        self.db.add_all(
+            [
+                self._suppression_signal(user_id, source_type, source_id, reason, suppress_until)
+                for source_id, reason in entries
+            ]
+        )
+        self.db.commit()
+
+    def _suppression_signal(
+        self,
+        user_id: int,
+        source_type: str,
+        source_id: int,
+        reason: str,
+        suppress_until: Optional[datetime],
+    ) -> DecisionSignal:
         if suppress_until is None:
             suppress_until = datetime.utcnow() + timedelta(days=self.MIN_DAYS_BETWEEN_REPEATS)
         
-        signal = DecisionSignal(
+        return DecisionSignal(
             user_id=user_id,
             source_type=source_type,
             source_id=source_id,
@@ -156,6 +223,3 @@ class InsightSuppressionService:
             suppression_reason=reason,
             suppression_until=suppress_until,
         )
-        self.db.add(signal)
-        self.db.commit()
-
@@ -4,6 +4,7 @@ from .insight_filter import filter_insights
 from .escalation import apply_escalation_rules
 from .protocol_guard import guard_protocol
 from .driver_graph_guard import prune_driver_edges
+from .metric_guardrails import apply_guardrails
 
 __all__ = [
     "get_policy",
@@ -12,5 +13,6 @@ __all__ = [
     "apply_escalation_rules",
     "guard_protocol",
     "prune_driver_edges",
+    "apply_guardrails",
 ]
 
@@ -0,0 +1,41 @@
+from app.domain.red_flags import RED_FLAGS
+
+
+from typing import Optional, Dict, Any
+
+
+def _guardrail_insight(rules: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "title": "Health warning",
+        "summary": rules["message"],
+        "status": "detected",
+        "confidence": 0.9,
+    }
+
+
+def apply_guardrails(
+    *,
+    metric_key: str,
+    values: list[float],
+) -> Optional[Dict[str, Any]]:
+    """
+    Returns a guardrail insight if triggered.
+    """
+    rules = RED_FLAGS.get(metric_key)
+    if rules is None:
+        return None
+
+    critical_low = rules.get("critical_low")
+    critical_high = rules.get("critical_high")
+
+    # "Every value at or past the threshold" is a single C-level max/min pass.
+    # An empty window counts as breached, as all() over no values did.
+    if critical_low is not None:
+        if not values or max(values) <= critical_low:
+            return _guardrail_insight(rules)
+
+    if critical_high is not None:
+        if not values or min(values) >= critical_high:
+            return _guardrail_insight(rules)
+
+    return None
@@ -1,4 +1,3 @@
-import json
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 
@@ -26,7 +25,7 @@ def make_safety_insight_payload(
         "insight_type": "safety",         # domain uses insight_type; transformer maps to status
         "confidence_score": 1.0,          # safety is deterministic rule
         "metric_key": triggers[0].get("metric_key") if triggers else None,
-        "metadata_json": json.dumps(metadata),
+        "metadata_json": metadata,  # serialized once by InsightRepository
     }
 
 
@@ -15,16 +15,23 @@ from datetime import datetime, timezone
 from apscheduler.schedulers.background import BackgroundScheduler
 
 from app.core.database import SessionLocal
-from app.engine.loop_runner import run_loop
+from app.engine.loop_runner import run_loop, prefetch_recent_points
 
 log = logging.getLogger(__name__)
 
 def _run_daily_loop_for_user_ids(user_ids: list[int]) -> None:
     db = SessionLocal()
     try:
+        # One health-data query for all users; on failure each run_loop fetches its own
+        try:
+            recent_points_by_user = prefetch_recent_points(db, user_ids)
+        except Exception:
+            db.rollback()
+            log.exception("daily_loop_prefetch_failed")
+            recent_points_by_user = {}
         for uid in user_ids:
             try:
-                run_loop(user_id=uid, db=db)
+                run_loop(user_id=uid, db=db, recent_points=recent_points_by_user.get(uid))
                 log.info("daily_loop_ok user_id=%s", uid)
             except Exception:
                 log.exception("daily_loop_failed user_id=%s", uid)
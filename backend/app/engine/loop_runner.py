@@ -1,27 +1,23 @@
-import json
+import heapq
 import logging
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import date, datetime, timedelta
 
 from app.domain.metric_registry import METRICS
 from app.domain.metric_policies import get_metric_policy
 from app.domain.models.baseline import Baseline
-from app.engine.signal_builder import fetch_recent_values
-
-logger = logging.getLogger(__name__)
-# Import apply_guardrails - need to handle the guardrails.py file vs guardrails/ package conflict
-# Import directly from the file using importlib
-import importlib.util
-import os
-backend_path = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-guardrails_file_path = os.path.join(backend_path, "app", "engine", "guardrails.py")
-spec = importlib.util.spec_from_file_location("app.engine.guardrails_file", guardrails_file_path)
-guardrails_file = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(guardrails_file)
-apply_guardrails = guardrails_file.apply_guardrails
-
+from app.engine.signal_builder import (
+    fetch_recent_values_bulk,
+    fetch_recent_values_bulk_for_users,
+    values_since,
+)
 from app.engine.guardrails.safety_guardrails import run_safety_gate
-from app.engine.guardrails import filter_insights, apply_escalation_rules
+from app.domain.safety.red_flags import RED_FLAG_METRIC_KEYS
+from app.engine.guardrails import apply_guardrails, filter_insights, apply_escalation_rules
 from app.engine.detectors import detect_change, detect_trend, detect_instability
 from app.engine.insight_factory import (
     make_change_insight_payload,
@@ -29,7 +25,7 @@ from app.engine.insight_factory import (
     make_instability_insight_payload,
 )
 from app.engine.governance.insight_suppression import InsightSuppressionService
-from app.domain.health_domains import domain_for_signal
+from app.domain.health_domains import HealthDomainKey, domain_for_signal
 from app.engine.domain_status import compute_domain_statuses
 from app.engine.governance.claim_policy import validate_language, get_policy
 from app.domain.repositories.insight_repository import InsightRepository
@@ -37,70 +33,519 @@ from app.domain.repositories.audit_repository import AuditRepository
 from app.domain.repositories.explanation_repository import ExplanationRepository
 from app.domain.repositories.symptom_repository import SymptomRepository
 from app.domain.repositories.daily_checkin_repository import DailyCheckInRepository
+from app.utils import json_codec
+
+logger = logging.getLogger(__name__)
+
+# Common symptom keywords to extract from check-in notes
+SYMPTOM_KEYWORDS = (
+    "fatigue", "tired", "exhausted", "brain fog", "headache", "pain", "ache",
+    "nausea", "dizziness", "anxiety", "depression", "insomnia", "sleep issues",
+    "joint pain", "muscle pain", "chest pain", "shortness of breath",
+)
+
+# PERF: Scan each note once for all keywords instead of once per keyword.
+# The zero-width lookahead reports a match at every offset, so overlapping keywords
+# ("headache"/"ache") are all found; the longest keyword wins at a given offset and
+# _SYMPTOM_KEYWORD_EXPANSION adds the shorter keywords it contains.
+_SYMPTOM_KEYWORD_RE = re.compile(
+    "(?=(%s))" % "|".join(re.escape(k) for k in sorted(SYMPTOM_KEYWORDS, key=len, reverse=True))
+)
+_SYMPTOM_KEYWORD_EXPANSION = {
+    k: tuple(other for other in SYMPTOM_KEYWORDS if other in k) for k in SYMPTOM_KEYWORDS
+}
+
+
+def _match_symptom_keywords(text: str) -> set[str]:
+    """Return every SYMPTOM_KEYWORDS entry that occurs as a substring of (lowercased) text."""
+    found: set[str] = set()
+    for m in _SYMPTOM_KEYWORD_RE.finditer(text):
+        found.update(_SYMPTOM_KEYWORD_EXPANSION[m.group(1)])
+    return found
+
+
+@lru_cache(maxsize=8)
+def _downgrade_template(claim_level: int) -> Tuple[str, Optional[str]]:
+    """
+    Policy-compliant (example language, first required phrase) for a claim level.
+
+    Claim policies are static, so the split/strip is done once per level.
+    Raises like get_policy() for invalid levels (callers fail closed).
+    """
+    policy_for_level = get_policy(claim_level)
+    example = (
+        policy_for_level.example_language.split(":", 1)[1].strip()
+        if ":" in policy_for_level.example_language
+        else policy_for_level.example_language
+    )
+    phrase = policy_for_level.must_use_phrases[0] if policy_for_level.must_use_phrases else None
+    return example, phrase
+
+
+@lru_cache(maxsize=512)
+def _validate_language_cached(claim_level: int, text: str) -> Tuple[bool, Tuple[str, ...]]:
+    """
+    validate_language() memoized on (claim level, text).
+
+    Detector titles/summaries are templated, so the same text recurs across
+    metrics and runs. Violations are returned as a tuple so cached results
+    can't be mutated by callers.
+    """
+    is_valid, violations = validate_language(claim_level, text)
+    return is_valid, tuple(violations)
+
+
+# windows (MVP)
+CHANGE_WINDOW_DAYS = 7
+TREND_WINDOW_DAYS = 14
+INSTABILITY_WINDOW_DAYS = 14
+
+
+@dataclass(frozen=True)
+class _DetectorSpec:
+    """
+    Per-insight-type parameters for _run_detector().
+
+    detect/make_payload are thin lambdas so the module-level detector and payload
+    functions are resolved at call time.
+    """
+
+    kind: str  # insight_type, MetricPolicy attribute and audit detector prefix
+    window_days: int
+    min_points: int
+    detect: Callable[..., Any]  # (metric_key, values, baseline, cfg) -> result or None
+    make_payload: Callable[..., Tuple[str, str, float, Dict[str, Any]]]
+    threshold_name: str  # key in the detector result
+    threshold_attr: str  # attribute on the per-type policy
+    summary_template: str  # used when the claim level is downgraded
+    default_phrase: str
+    audit_metadata: Callable[[Any, Baseline], Dict[str, Any]]
+    record_insufficient_data: bool = False
+    explain_with_baseline: bool = False
+
+
+_DETECTORS: Tuple[_DetectorSpec, ...] = (
+    _DetectorSpec(
+        kind="change",
+        window_days=CHANGE_WINDOW_DAYS,
+        min_points=5,
+        detect=lambda metric_key, values, baseline, cfg: detect_change(
+            metric_key=metric_key,
+            values=values,
+            baseline_mean=baseline.mean,
+            baseline_std=baseline.std,
+            window_days=CHANGE_WINDOW_DAYS,
+            z_threshold=cfg.z_threshold,
+        ),
+        make_payload=lambda result: make_change_insight_payload(result, expected_days=CHANGE_WINDOW_DAYS),
+        threshold_name="z_score",
+        threshold_attr="z_threshold",
+        summary_template="Recent data shows {phrase} in {metric_key}.",
+        default_phrase="a change",
+        audit_metadata=lambda result, baseline: {
+            "baseline_mean": baseline.mean,
+            "baseline_std": baseline.std,
+        },
+        record_insufficient_data=True,
+        explain_with_baseline=True,
+    ),
+    _DetectorSpec(
+        kind="trend",
+        window_days=TREND_WINDOW_DAYS,
+        min_points=7,
+        detect=lambda metric_key, values, baseline, cfg: detect_trend(
+            metric_key=metric_key,
+            values=values,
+            window_days=TREND_WINDOW_DAYS,
+            slope_threshold=cfg.slope_threshold,
+        ),
+        make_payload=lambda result: make_trend_insight_payload(result, expected_days=TREND_WINDOW_DAYS),
+        threshold_name="slope",
+        threshold_attr="slope_threshold",
+        summary_template="Data {phrase} in {metric_key}.",
+        default_phrase="shows a trend",
+        audit_metadata=lambda result, baseline: {"slope": result.get("slope")},
+    ),
+    _DetectorSpec(
+        kind="instability",
+        window_days=INSTABILITY_WINDOW_DAYS,
+        min_points=7,
+        detect=lambda metric_key, values, baseline, cfg: detect_instability(
+            metric_key=metric_key,
+            values=values,
+            baseline_std=baseline.std,
+            window_days=INSTABILITY_WINDOW_DAYS,
+            ratio_threshold=cfg.ratio_threshold,
+        ),
+        make_payload=lambda result: make_instability_insight_payload(result, expected_days=INSTABILITY_WINDOW_DAYS),
+        threshold_name="std_ratio",
+        threshold_attr="ratio_threshold",
+        summary_template="Variability {phrase} in {metric_key}.",
+        default_phrase="has changed",
+        audit_metadata=lambda result, baseline: {"baseline_std": baseline.std},
+    ),
+)
+
+
+def _build_meta(
+    evidence: Dict[str, Any],
+    metric_key: str,
+    dk: Optional[HealthDomainKey],
+    claim_level: int,
+    violations: list,
+) -> Dict[str, Any]:
+    """
+    Persist evidence in a shape that satisfies invariants:
+    - top-level fields for existing transformers
+    - plus an "evidence" object (shallow copy) for invariant checks
+    """
+    meta = {
+        **evidence,
+        "metric_key": metric_key,
+        # Domain metadata only (no behavior impact)
+        "domain_key": dk.value if dk else None,
+        "claim_level": claim_level,
+        "policy_violations": violations,
+    }
+    meta["evidence"] = meta.copy()
+    return meta
+
+
+def _run_detector(
+    dspec: _DetectorSpec,
+    *,
+    repo: InsightRepository,
+    pending_audits: list,
+    user_id: int,
+    metric_key: str,
+    dk: Optional[HealthDomainKey],
+    policy: Any,
+    baseline: Any,  # Baseline row with .mean / .std
+    values: list[float],
+    run_detection: bool = True,
+) -> bool:
+    """
+    Detect -> claim-policy governance -> stage insight -> buffer audit, for one metric.
+
+    With run_detection=False only the insufficient-data check runs (the daily cap
+    is already used up). Returns False when the remaining detectors for this metric
+    must be skipped (insufficient data, or a fail-closed governance error).
+    """
+    cfg = getattr(policy, dspec.kind)
+
+    # WEEK 4: Check for insufficient data
+    if len(values) < dspec.min_points:
+        if dspec.record_insufficient_data:
+            # Create "insufficient data" insight instead of silently skipping
+            repo.stage(
+                user_id=user_id,
+                title=f"Insufficient data for {metric_key}",
+                description=f"Not enough data points ({len(values)} < {dspec.min_points}) to detect changes in {metric_key}. Please collect more data.",
+                insight_type="insufficient_data",
+                confidence_score=1.0,  # High confidence that data is insufficient
+                metadata_json={
+                    "metric_key": metric_key,
+                    # Domain metadata only (no behavior impact)
+                    "domain_key": dk.value if dk else None,
+                    "data_points": len(values),
+                    "required_points": dspec.min_points,
+                    "status": "insufficient_data",
+                },
+            )
+        return False
+
+    if not run_detection:
+        return True
+
+    result = dspec.detect(metric_key, values, baseline, cfg)
+    if not result:
+        return True
+
+    title, summary, confidence, evidence = dspec.make_payload(result)
+
+    # GOVERNANCE: Apply claim policy enforcement
+    # Map confidence to claim level (1-5 scale)
+    try:
+        claim_level = min(5, max(1, int(confidence * 5) + 1))
+        is_valid, violations = _validate_language_cached(claim_level, f"{title} {summary}")
+        violations = list(violations)
+    except Exception as e:
+        # FAIL-CLOSED: if governance validation fails, drop the output rather than surfacing it.
+        logger.error(
+            "claim_policy_validation_failed_drop_output",
+            extra={
+                "user_id": user_id,
+                "metric_key": metric_key,
+                "insight_type": dspec.kind,
+                "error_type": type(e).__name__,
+                "error": str(e),
+            },
+            exc_info=True,
+        )
+        return False
+    if not is_valid:
+        # Downgrade or drop insight that violates claim policy
+        logger.warning(
+            "%s insight violates claim policy (level %s): %s. Title: %s, Summary: %s",
+            dspec.kind.capitalize(), claim_level, violations, title, summary,
+        )
+        # Downgrade confidence and adjust language
+        claim_level = max(1, claim_level - 1)
+        try:
+            example, phrase = _downgrade_template(claim_level)
+        except Exception as e:
+            # FAIL-CLOSED: drop rather than surfacing un-governed text
+            logger.error(
+                "claim_policy_lookup_failed_drop_output",
+                extra={
+                    "user_id": user_id,
+                    "metric_key": metric_key,
+                    "insight_type": dspec.kind,
+                    "claim_level": claim_level,
+                    "error_type": type(e).__name__,
+                    "error": str(e),
+                },
+                exc_info=True,
+            )
+            return False
+        # Use policy-compliant language
+        title = f"{metric_key}: {example}"
+        summary = dspec.summary_template.format(phrase=phrase or dspec.default_phrase, metric_key=metric_key)
+        confidence = min(confidence, claim_level / 5.0)  # Cap confidence to policy level
+
+    meta = _build_meta(evidence, metric_key, dk, claim_level, violations if not is_valid else [])
+    insight = repo.stage(
+        user_id=user_id,
+        title=title,
+        description=summary,
+        insight_type=dspec.kind,
+        confidence_score=confidence,
+        metadata_json=meta,
+    )
+
+    # WEEK 4: Create audit event for explainability (written once insight ids exist)
+    try:
+        audit_kwargs = dict(
+            user_id=user_id,
+            entity_type="insight",
+            decision_type="created",
+            decision_reason=f"{dspec.kind.capitalize()} detected in {metric_key}",
+            source_metrics=[metric_key],
+            time_windows={metric_key: {"start": result.get("window_start"), "end": result.get("window_end")}},
+            detectors_used=[f"{dspec.kind}_detector"],
+            thresholds_crossed=[{
+                "threshold": dspec.threshold_name,
+                "value": result.get(dspec.threshold_name),
+                "threshold_value": getattr(cfg, dspec.threshold_attr),
+            }],
+            safety_checks_applied=[],
+            metadata={
+                # Domain metadata only (no behavior impact)
+                "domain_key": dk.value if dk else None,
+                **dspec.audit_metadata(result, baseline),
+            },
+        )
+        edge_kwargs = None
+        if dspec.explain_with_baseline:
+            # Create explanation edge from baseline to insight
+            edge_kwargs = dict(
+                target_type="insight",
+                source_type="baseline",
+                source_id=None,  # Baseline doesn't have a single ID
+                contribution_weight=1.0,
+                description=f"{dspec.kind.capitalize()} detected relative to baseline (mean={baseline.mean:.2f}, std={baseline.std:.2f})",
+            )
+        pending_audits.append((insight, audit_kwargs, edge_kwargs))
+    except Exception as e:
+        logger.warning("Failed to build audit event for %s %s insight: %s", metric_key, dspec.kind, e)
+    return True
+
+
+def _insight_metadata(ins: Any) -> Dict[str, Any]:
+    """
+    Metadata dict for an insight created in this run.
+
+    InsightRepository keeps the dict it serialized on the instance (_metadata);
+    otherwise the JSON is parsed once and memoized there. Callers that change the
+    metadata mutate this dict and re-serialize it, so the cache stays in sync.
+    """
+    metadata = getattr(ins, "_metadata", None)
+    if isinstance(metadata, dict):
+        return metadata
+    raw = ins.metadata_json
+    if isinstance(raw, dict):
+        return raw
+    metadata = {}
+    if raw:
+        try:
+            parsed = json_codec.loads(raw)
+        except Exception:
+            parsed = None
+        if isinstance(parsed, dict):
+            metadata = parsed
+    try:
+        ins._metadata = metadata
+    except AttributeError:
+        pass
+    return metadata
+
+
+def _domain_statuses_changed(audit_repo: AuditRepository, user_id: int, payload: Dict[str, str]) -> bool:
+    """
+    True unless the user's latest domain_status audit entry recorded exactly these statuses.
 
+    Costs one SELECT (the latest entry only) per run. An unchanged run then skips
+    the audit INSERT, commit and refresh.
+    """
+    latest = audit_repo.list_for_entity(user_id=user_id, entity_type="domain_status", entity_id=user_id, limit=1)
+    if not latest or not latest[0].metadata_json:
+        return True
+    try:
+        previous = json_codec.loads(latest[0].metadata_json).get("domain_statuses")
+    except Exception:
+        return True
+    return previous != payload
+
+
+def prefetch_recent_points(
+    db: Session,
+    user_ids: Iterable[int],
+) -> Dict[int, Dict[str, List[Tuple[datetime, float]]]]:
+    """
+    Recent registry-metric points for several users in one query, keyed by user_id.
+
+    Each user's entry is what run_loop() would fetch for itself; pass it as
+    run_loop(..., recent_points=...) when looping over many users.
+    """
+    metric_keys = tuple(METRICS.keys())
+    return fetch_recent_values_bulk_for_users(
+        db=db,
+        user_ids=user_ids,
+        metric_keys=metric_keys,
+        window_days=max(d.window_days for d in _DETECTORS),
+    )
 
-def run_loop(db: Session, user_id: int) -> dict:
+
+def run_loop(
+    db: Session,
+    user_id: int,
+    recent_points: Optional[Dict[str, List[Tuple[datetime, float]]]] = None,
+) -> dict:
     """
     Runs detection across all registry metrics for a user.
     Creates Insights with status="detected" and structured evidence.
     
     WEEK 4: Populates audit events and explanation edges for explainability.
+
+    recent_points: this user's entry from prefetch_recent_points(); fetched here when omitted.
     """
-    created = []
+    pending_audits: list = []
     repo = InsightRepository(db)
     audit_repo = AuditRepository(db)
     explanation_repo = ExplanationRepository(db)
 
+    # Registry keys are read once per run (METRICS may be swapped at runtime, e.g. in tests).
+    metric_keys = tuple(METRICS.keys())
+
+    now = datetime.utcnow()
+    suppression_service = InsightSuppressionService(db)
+
+    # PERF: Fetch the user's registry-metric baselines once instead of one query per metric,
+    # loading only the columns the detectors read (rows expose .mean / .std).
+    # Today's insight count (for the daily cap below) rides along as a scalar subquery column,
+    # so it costs no round trip of its own when the user has any baseline.
+    existing_today_pre_run = None
+    try:
+        baseline_rows = (
+            db.query(
+                Baseline.metric_type,
+                Baseline.mean,
+                Baseline.std,
+                suppression_service.count_today_subquery(user_id, now).label("today_count"),
+            )
+            .filter(Baseline.user_id == user_id, Baseline.metric_type.in_(metric_keys))
+            .all()
+        )
+        baselines_by_metric = {b.metric_type: b for b in baseline_rows}
+        if baseline_rows:
+            existing_today_pre_run = baseline_rows[0].today_count
+    except Exception as e:
+        # SECURITY FIX: Log baseline retrieval failure instead of silently skipping
+        logger.warning(
+            "baseline_retrieval_failed",
+            extra={
+                "user_id": user_id,
+                "error": str(e),
+            },
+        )
+        baselines_by_metric = {}
+
+    # PERF: One query for every metric over the widest window; shorter windows are sliced in memory.
+    today_date = date.today()
+    if recent_points is None:
+        recent_points = fetch_recent_values_bulk(
+            db=db,
+            user_id=user_id,
+            metric_keys=metric_keys,
+            window_days=max(d.window_days for d in _DETECTORS),
+        )
+
+    # Each (metric, window) slice is built once; the guardrail and change detector share
+    # the 7-day slice, trend and instability the 14-day one. Callers must not mutate it.
+    window_slices: Dict[Tuple[str, int], list[float]] = {}
+
+    def _recent_values(metric_key: str, window_days: int) -> list[float]:
+        cache_key = (metric_key, window_days)
+        values = window_slices.get(cache_key)
+        if values is None:
+            values = values_since(recent_points.get(metric_key, []), now - timedelta(days=window_days))
+            window_slices[cache_key] = values
+        return values
+
     # 0) Safety gate - check for red flags BEFORE normal detectors
+    # PERF: Single pass over the registry feeds both the safety gate (3-day averages)
+    # and the detectors below (policy and enabled detectors resolved once per metric).
+    # Averages are only computed for metrics that a red-flag rule actually reads.
     latest_metrics = {}
-    for metric_key in METRICS.keys():
-        values = fetch_recent_values(
-            db=db, user_id=user_id, metric_key=metric_key, window_days=3
+    metric_policies = {}
+    for metric_key in metric_keys:
+        if metric_key in RED_FLAG_METRIC_KEYS:
+            values = _recent_values(metric_key, 3)
+            if values:
+                latest_metrics[metric_key] = float(sum(values) / len(values))
+        try:
+            policy = get_metric_policy(metric_key)
+        except ValueError:
+            # Metrics without policies are not run through the detectors
+            continue
+        allowed = policy.allowed_insights
+        metric_policies[metric_key] = (
+            policy,
+            tuple(d for d in _DETECTORS if d.kind in allowed and getattr(policy, d.kind)),
         )
-        if values:
-            latest_metrics[metric_key] = float(sum(values) / len(values))
 
     # Wire symptom tags from check-ins and symptoms into safety gate
-    symptom_tags = []
+    symptom_tags: set[str] = set()
     try:
         # Get recent symptoms (last 7 days)
-        symptom_repo = SymptomRepository(db)
-        recent_symptoms = symptom_repo.list_recent(user_id=user_id, days=7)
-        symptom_tags.extend([s.symptom_name for s in recent_symptoms if s.symptom_name])
-        
+        # PERF: only the name / notes columns are selected; users without symptom logs
+        # or check-in notes (the common case) get an empty result without row hydration.
+        symptom_tags.update(SymptomRepository(db).list_recent_names(user_id=user_id, days=7))
+
         # Extract symptom-like keywords from check-in notes (last 3 days)
-        checkin_repo = DailyCheckInRepository(db)
-        from datetime import date, timedelta
-        three_days_ago = date.today() - timedelta(days=3)
-        recent_checkins = checkin_repo.list_range(user_id=user_id, start_date=three_days_ago, end_date=date.today())
-        
-        # Common symptom keywords to extract from notes
-        symptom_keywords = [
-            "fatigue", "tired", "exhausted", "brain fog", "headache", "pain", "ache",
-            "nausea", "dizziness", "anxiety", "depression", "insomnia", "sleep issues",
-            "joint pain", "muscle pain", "chest pain", "shortness of breath"
-        ]
-        for checkin in recent_checkins:
-            if checkin.notes:
-                notes_lower = checkin.notes.lower()
-                for keyword in symptom_keywords:
-                    if keyword in notes_lower and keyword not in symptom_tags:
-                        symptom_tags.append(keyword)
+        three_days_ago = today_date - timedelta(days=3)
+        for notes in DailyCheckInRepository(db).list_notes_range(
+            user_id=user_id, start_date=three_days_ago, end_date=today_date
+        ):
+            symptom_tags.update(_match_symptom_keywords(notes.lower()))
     except Exception as e:
-        logger.warning(f"Failed to extract symptom tags: {e}")
+        logger.warning("Failed to extract symptom tags: %s", e)
 
-    safety_payload = run_safety_gate(user_id=user_id, latest_metrics=latest_metrics, symptom_tags=symptom_tags)
+    safety_payload = run_safety_gate(user_id=user_id, latest_metrics=latest_metrics, symptom_tags=sorted(symptom_tags))
     if safety_payload:
         # Pure metadata only: attach domain_key deterministically from the primary metric_key (if present).
         # Backward compatible: if safety payload has no metric_key, domain_key remains None.
-        try:
-            meta_obj = safety_payload.get("metadata_json")
-            if isinstance(meta_obj, str) and meta_obj:
-                meta_obj = json.loads(meta_obj)
-            if not isinstance(meta_obj, dict):
-                meta_obj = {}
-        except Exception:
-            meta_obj = {}
+        meta_obj = dict(safety_payload.get("metadata_json") or {})
         mk = meta_obj.get("metric_key")
         dk = domain_for_signal(mk) if isinstance(mk, str) else None
         meta_obj["domain_key"] = dk.value if dk else None
@@ -111,7 +556,7 @@ def run_loop(db: Session, user_id: int) -> dict:
             title=safety_payload["title"],
             description=safety_payload["description"],
             confidence_score=safety_payload["confidence_score"],
-            metadata_json=json.dumps(meta_obj),
+            metadata_json=meta_obj,
         )
         return {
             "created": 1,
@@ -119,453 +564,103 @@ def run_loop(db: Session, user_id: int) -> dict:
             "items": [created_insight],
         }
 
-    # windows (MVP)
-    change_window_days = 7
-    trend_window_days = 14
-    instability_window_days = 14
-
     # GOVERNANCE: Daily cap should be enforced against insights that existed *before* this run.
     # If we count "today" after creating new insights, we end up double-counting this run and
-    # suppressing too aggressively (even when under the cap). So capture the pre-run count now.
-    suppression_service = InsightSuppressionService(db)
-    today = datetime.utcnow()
-    try:
-        existing_today_pre_run = suppression_service._count_today_insights(user_id, today)  # internal helper OK here
-    except Exception:
-        existing_today_pre_run = 0
-
-    for metric_key in METRICS.keys():
-        # Get metric policy
+    # suppressing too aggressively (even when under the cap). So the pre-run count was captured
+    # with the baselines above; users without baselines get it from a query of its own.
+    today = now
+    if existing_today_pre_run is None:
         try:
-            policy = get_metric_policy(metric_key)
-        except ValueError:
-            # Skip metrics without policies
-            continue
+            existing_today_pre_run = suppression_service._count_today_insights(user_id, today)  # internal helper OK here
+        except Exception:
+            existing_today_pre_run = 0
 
+    # PERF: Once today's cap is used up, detector insights would all be cap-suppressed, so the
+    # detectors (and their claim-policy / evidence work) are skipped. Guardrail health warnings and
+    # insufficient-data insights are still created: they are cheap, and stay visible in the feed
+    # even when cap-suppressed.
+    daily_cap_reached = existing_today_pre_run >= suppression_service.MAX_DAILY_INSIGHTS
+    if daily_cap_reached:
+        logger.info(
+            "daily_cap_reached_skip_detection",
+            extra={"user_id": user_id, "existing_today": existing_today_pre_run},
+        )
+
+    for metric_key, (policy, detectors) in metric_policies.items():
         # SECURITY FIX (Risk #5): Explicit baseline availability check
-        try:
-            baseline = (
-                db.query(Baseline)
-                .filter(Baseline.user_id == user_id, Baseline.metric_type == metric_key)
-                .one_or_none()
-            )
-            if baseline is None:
-                # Baseline not computed yet - skip this metric for now
-                # This is expected for new metrics/users
-                continue
-        except Exception as e:
-            # SECURITY FIX: Log baseline retrieval failure instead of silently skipping
-            logger.warning(
-                "baseline_retrieval_failed",
-                extra={
-                    "user_id": user_id,
-                    "metric_key": metric_key,
-                    "error": str(e),
-                },
-            )
+        baseline = baselines_by_metric.get(metric_key)
+        if baseline is None:
+            # Baseline not computed yet - skip this metric for now
+            # This is expected for new metrics/users
             continue
 
+        # Domain metadata only (no behavior impact); resolved once per metric.
+        dk = domain_for_signal(metric_key)
+
         # 1) Guardrails check (uses last 5 values from change window)
-        recent_values_for_guard = fetch_recent_values(
-            db=db, user_id=user_id, metric_key=metric_key, window_days=change_window_days
-        )[-5:]
+        recent_values_for_guard = _recent_values(metric_key, CHANGE_WINDOW_DAYS)[-5:]
         guardrail = apply_guardrails(metric_key=metric_key, values=recent_values_for_guard)
         if guardrail:
-            dk = domain_for_signal(metric_key)
-            insight = repo.create(
+            # Staged like every other insight, so flush_all() below returns it in `created`
+            repo.stage(
                 user_id=user_id,
                 title=guardrail["title"],
                 description=guardrail["summary"],
                 insight_type="change",
                 confidence_score=guardrail["confidence"],
-                metadata_json=json.dumps(
-                    {
-                        "metric_key": metric_key,
-                        # Domain metadata only (no behavior impact)
-                        "domain_key": dk.value if dk else None,
-                        "status": guardrail["status"],
-                    }
-                ),
+                metadata_json={
+                    "metric_key": metric_key,
+                    # Domain metadata only (no behavior impact)
+                    "domain_key": dk.value if dk else None,
+                    "status": guardrail["status"],
+                },
             )
-            created.append(insight)
             continue
 
-        # 2) Change detection (7d)
-        if "change" in policy.allowed_insights and policy.change:
-            change_values = fetch_recent_values(
-                db=db, user_id=user_id, metric_key=metric_key, window_days=change_window_days
-            )
-            
-            # WEEK 4: Check for insufficient data
-            if len(change_values) < 5:
-                dk = domain_for_signal(metric_key)
-                # Create "insufficient data" insight instead of silently skipping
-                insight = repo.create(
-                    user_id=user_id,
-                    title=f"Insufficient data for {metric_key}",
-                    description=f"Not enough data points ({len(change_values)} < 5) to detect changes in {metric_key}. Please collect more data.",
-                    insight_type="insufficient_data",
-                    confidence_score=1.0,  # High confidence that data is insufficient
-                    metadata_json=json.dumps({
-                        "metric_key": metric_key,
-                        # Domain metadata only (no behavior impact)
-                        "domain_key": dk.value if dk else None,
-                        "data_points": len(change_values),
-                        "required_points": 5,
-                        "status": "insufficient_data",
-                    }),
-                )
-                created.append(insight)
-                continue
-            
-            change = detect_change(
-                metric_key=metric_key,
-                values=change_values,
-                baseline_mean=baseline.mean,
-                baseline_std=baseline.std,
-                window_days=change_window_days,
-                z_threshold=policy.change.z_threshold,
-            )
-            if change:
-                title, summary, confidence, evidence = make_change_insight_payload(change, expected_days=change_window_days)
-                
-                # GOVERNANCE: Apply claim policy enforcement
-                # Map confidence to claim level (1-5 scale)
-                try:
-                    claim_level = min(5, max(1, int(confidence * 5) + 1))
-                    is_valid, violations = validate_language(claim_level, f"{title} {summary}")
-                except Exception as e:
-                    # FAIL-CLOSED: if governance validation fails, drop the output rather than surfacing it.
-                    logger.error(
-                        "claim_policy_validation_failed_drop_output",
-                        extra={
-                            "user_id": user_id,
-                            "metric_key": metric_key,
-                            "insight_type": "change",
-                            "error_type": type(e).__name__,
-                            "error": str(e),
-                        },
-                        exc_info=True,
-                    )
-                    continue
-                if not is_valid:
-                    # Downgrade or drop insight that violates claim policy
-                    logger.warning(
-                        f"Insight violates claim policy (level {claim_level}): {violations}. "
-                        f"Title: {title}, Summary: {summary}"
-                    )
-                    # Downgrade confidence and adjust language
-                    claim_level = max(1, claim_level - 1)
-                    try:
-                        policy_for_level = get_policy(claim_level)
-                    except Exception as e:
-                        # FAIL-CLOSED: drop rather than surfacing un-governed text
-                        logger.error(
-                            "claim_policy_lookup_failed_drop_output",
-                            extra={
-                                "user_id": user_id,
-                                "metric_key": metric_key,
-                                "insight_type": "change",
-                                "claim_level": claim_level,
-                                "error_type": type(e).__name__,
-                                "error": str(e),
-                            },
-                            exc_info=True,
-                        )
-                        continue
-                    # Use policy-compliant language
-                    example = (
-                        policy_for_level.example_language.split(":", 1)[1].strip()
-                        if ":" in policy_for_level.example_language
-                        else policy_for_level.example_language
-                    )
-                    title = f"{metric_key}: {example}"
-                    summary = f"Recent data shows {policy_for_level.must_use_phrases[0] if policy_for_level.must_use_phrases else 'a change'} in {metric_key}."
-                    confidence = min(confidence, claim_level / 5.0)  # Cap confidence to policy level
-                
-                # Persist evidence in a shape that satisfies invariants:
-                # - top-level fields for existing transformers
-                # - plus an "evidence" object for invariant checks
-                evidence_payload = dict(evidence)
-                evidence_payload["metric_key"] = metric_key
-                # Domain metadata only (no behavior impact)
-                dk = domain_for_signal(metric_key)
-                evidence_payload["domain_key"] = dk.value if dk else None
-                evidence_payload["claim_level"] = claim_level
-                evidence_payload["policy_violations"] = violations if not is_valid else []
-                meta = dict(evidence_payload)
-                meta["evidence"] = dict(evidence_payload)
-                insight = repo.create(
-                    user_id=user_id,
-                    title=title,
-                    description=summary,
-                    insight_type="change",
-                    confidence_score=confidence,
-                    metadata_json=json.dumps(meta),
-                )
-                created.append(insight)
-                
-                # WEEK 4: Create audit event for explainability
-                try:
-                    dk = domain_for_signal(metric_key)
-                    audit_repo.create(
-                        user_id=user_id,
-                        entity_type="insight",
-                        entity_id=insight.id,
-                        decision_type="created",
-                        decision_reason=f"Change detected in {metric_key}",
-                        source_metrics=[metric_key],
-                        time_windows={metric_key: {"start": change.get("window_start"), "end": change.get("window_end")}},
-                        detectors_used=["change_detector"],
-                        thresholds_crossed=[{"threshold": "z_score", "value": change.get("z_score"), "threshold_value": policy.change.z_threshold}],
-                        safety_checks_applied=[],
-                        metadata={
-                            # Domain metadata only (no behavior impact)
-                            "domain_key": dk.value if dk else None,
-                            "baseline_mean": baseline.mean,
-                            "baseline_std": baseline.std,
-                        },
-                    )
-                    
-                    # Create explanation edge from baseline to insight
-                    explanation_repo.create_edge(
-                        target_type="insight",
-                        target_id=insight.id,
-                        source_type="baseline",
-                        source_id=None,  # Baseline doesn't have a single ID
-                        contribution_weight=1.0,
-                        description=f"Change detected relative to baseline (mean={baseline.mean:.2f}, std={baseline.std:.2f})",
-                    )
-                except Exception as e:
-                    logger.warning(f"Failed to create audit event for insight {insight.id}: {e}")
-
-        # 3) Trend detection (14d)
-        if "trend" in policy.allowed_insights and policy.trend:
-            trend_values = fetch_recent_values(
-                db=db, user_id=user_id, metric_key=metric_key, window_days=trend_window_days
-            )
-            
-            # WEEK 4: Check for insufficient data
-            if len(trend_values) < 7:
-                # Skip trend detection if insufficient data (already handled above for change)
-                continue
-            
-            trend = detect_trend(
-                metric_key=metric_key,
-                values=trend_values,
-                window_days=trend_window_days,
-                slope_threshold=policy.trend.slope_threshold,
-            )
-            if trend:
-                title, summary, confidence, evidence = make_trend_insight_payload(trend, expected_days=trend_window_days)
-                
-                # GOVERNANCE: Apply claim policy enforcement
-                try:
-                    claim_level = min(5, max(1, int(confidence * 5) + 1))
-                    is_valid, violations = validate_language(claim_level, f"{title} {summary}")
-                except Exception as e:
-                    # FAIL-CLOSED: if governance validation fails, drop the output rather than surfacing it.
-                    logger.error(
-                        "claim_policy_validation_failed_drop_output",
-                        extra={
-                            "user_id": user_id,
-                            "metric_key": metric_key,
-                            "insight_type": "trend",
-                            "error_type": type(e).__name__,
-                            "error": str(e),
-                        },
-                        exc_info=True,
-                    )
-                    continue
-                if not is_valid:
-                    logger.warning(f"Trend insight violates claim policy (level {claim_level}): {violations}")
-                    claim_level = max(1, claim_level - 1)
-                    try:
-                        policy_for_level = get_policy(claim_level)
-                    except Exception as e:
-                        # FAIL-CLOSED: drop rather than surfacing un-governed text
-                        logger.error(
-                            "claim_policy_lookup_failed_drop_output",
-                            extra={
-                                "user_id": user_id,
-                                "metric_key": metric_key,
-                                "insight_type": "trend",
-                                "claim_level": claim_level,
-                                "error_type": type(e).__name__,
-                                "error": str(e),
-                            },
-                            exc_info=True,
-                        )
-                        continue
-                    example = (
-                        policy_for_level.example_language.split(":", 1)[1].strip()
-                        if ":" in policy_for_level.example_language
-                        else policy_for_level.example_language
-                    )
-                    title = f"{metric_key}: {example}"
-                    summary = f"Data {policy_for_level.must_use_phrases[0] if policy_for_level.must_use_phrases else 'shows a trend'} in {metric_key}."
-                    confidence = min(confidence, claim_level / 5.0)
-                
-                evidence_payload = dict(evidence)
-                evidence_payload["metric_key"] = metric_key
-                dk = domain_for_signal(metric_key)
-                evidence_payload["domain_key"] = dk.value if dk else None
-                evidence_payload["claim_level"] = claim_level
-                evidence_payload["policy_violations"] = violations if not is_valid else []
-                meta = dict(evidence_payload)
-                meta["evidence"] = dict(evidence_payload)
-                insight = repo.create(
-                    user_id=user_id,
-                    title=title,
-                    description=summary,
-                    insight_type="trend",
-                    confidence_score=confidence,
-                    metadata_json=json.dumps(meta),
-                )
-                created.append(insight)
-                
-                # WEEK 4: Create audit event
-                try:
-                    dk = domain_for_signal(metric_key)
-                    audit_repo.create(
-                        user_id=user_id,
-                        entity_type="insight",
-                        entity_id=insight.id,
-                        decision_type="created",
-                        decision_reason=f"Trend detected in {metric_key}",
-                        source_metrics=[metric_key],
-                        time_windows={metric_key: {"start": trend.get("window_start"), "end": trend.get("window_end")}},
-                        detectors_used=["trend_detector"],
-                        thresholds_crossed=[{"threshold": "slope", "value": trend.get("slope"), "threshold_value": policy.trend.slope_threshold}],
-                        safety_checks_applied=[],
-                        metadata={
-                            "domain_key": dk.value if dk else None,
-                            "slope": trend.get("slope"),
-                        },
-                    )
-                except Exception as e:
-                    logger.warning(f"Failed to create audit event for trend insight {insight.id}: {e}")
-
-        # 4) Instability detection (14d)
-        if "instability" in policy.allowed_insights and policy.instability:
-            inst_values = fetch_recent_values(
-                db=db, user_id=user_id, metric_key=metric_key, window_days=instability_window_days
-            )
-            
-            # WEEK 4: Check for insufficient data
-            if len(inst_values) < 7:
-                continue
-            
-            instability = detect_instability(
+        # 2-4) Change (7d), trend (14d) and instability (14d) detection
+        for dspec in detectors:
+            keep_going = _run_detector(
+                dspec,
+                repo=repo,
+                pending_audits=pending_audits,
+                user_id=user_id,
                 metric_key=metric_key,
-                values=inst_values,
-                baseline_std=baseline.std,
-                window_days=instability_window_days,
-                ratio_threshold=policy.instability.ratio_threshold,
+                dk=dk,
+                policy=policy,
+                baseline=baseline,
+                values=_recent_values(metric_key, dspec.window_days),
+                run_detection=not daily_cap_reached,
             )
-            if instability:
-                title, summary, confidence, evidence = make_instability_insight_payload(instability, expected_days=instability_window_days)
-                
-                # GOVERNANCE: Apply claim policy enforcement
-                try:
-                    claim_level = min(5, max(1, int(confidence * 5) + 1))
-                    is_valid, violations = validate_language(claim_level, f"{title} {summary}")
-                except Exception as e:
-                    # FAIL-CLOSED: if governance validation fails, drop the output rather than surfacing it.
-                    logger.error(
-                        "claim_policy_validation_failed_drop_output",
-                        extra={
-                            "user_id": user_id,
-                            "metric_key": metric_key,
-                            "insight_type": "instability",
-                            "error_type": type(e).__name__,
-                            "error": str(e),
-                        },
-                        exc_info=True,
-                    )
-                    continue
-                if not is_valid:
-                    logger.warning(f"Instability insight violates claim policy (level {claim_level}): {violations}")
-                    claim_level = max(1, claim_level - 1)
-                    try:
-                        policy_for_level = get_policy(claim_level)
-                    except Exception as e:
-                        # FAIL-CLOSED: drop rather than surfacing un-governed text
-                        logger.error(
-                            "claim_policy_lookup_failed_drop_output",
-                            extra={
-                                "user_id": user_id,
-                                "metric_key": metric_key,
-                                "insight_type": "instability",
-                                "claim_level": claim_level,
-                                "error_type": type(e).__name__,
-                                "error": str(e),
-                            },
-                            exc_info=True,
-                        )
-                        continue
-                    example = (
-                        policy_for_level.example_language.split(":", 1)[1].strip()
-                        if ":" in policy_for_level.example_language
-                        else policy_for_level.example_language
-                    )
-                    title = f"{metric_key}: {example}"
-                    summary = f"Variability {policy_for_level.must_use_phrases[0] if policy_for_level.must_use_phrases else 'has changed'} in {metric_key}."
-                    confidence = min(confidence, claim_level / 5.0)
-                
-                evidence_payload = dict(evidence)
-                evidence_payload["metric_key"] = metric_key
-                dk = domain_for_signal(metric_key)
-                evidence_payload["domain_key"] = dk.value if dk else None
-                evidence_payload["claim_level"] = claim_level
-                evidence_payload["policy_violations"] = violations if not is_valid else []
-                meta = dict(evidence_payload)
-                meta["evidence"] = dict(evidence_payload)
-                insight = repo.create(
-                    user_id=user_id,
-                    title=title,
-                    description=summary,
-                    insight_type="instability",
-                    confidence_score=confidence,
-                    metadata_json=json.dumps(meta),
-                )
-                created.append(insight)
-                
-                # WEEK 4: Create audit event
-                try:
-                    dk = domain_for_signal(metric_key)
-                    audit_repo.create(
-                        user_id=user_id,
-                        entity_type="insight",
-                        entity_id=insight.id,
-                        decision_type="created",
-                        decision_reason=f"Instability detected in {metric_key}",
-                        source_metrics=[metric_key],
-                        time_windows={metric_key: {"start": instability.get("window_start"), "end": instability.get("window_end")}},
-                        detectors_used=["instability_detector"],
-                        thresholds_crossed=[{"threshold": "std_ratio", "value": instability.get("std_ratio"), "threshold_value": policy.instability.ratio_threshold}],
-                        safety_checks_applied=[],
-                        metadata={
-                            "domain_key": dk.value if dk else None,
-                            "baseline_std": baseline.std,
-                        },
-                    )
-                except Exception as e:
-                    logger.warning(f"Failed to create audit event for instability insight {insight.id}: {e}")
+            if not keep_going:
+                break
+
+    # PERF: Flush every staged insight in one batch, write the audit trail that needs
+    # their ids as one batch per table, then commit once. Reading ins.id before the
+    # commit avoids a refresh SELECT per insight.
+    # The audit rows share a SAVEPOINT: if any of them fails, the whole audit batch is
+    # rolled back, but the insights are still committed.
+    created = repo.flush_all()
+    if pending_audits:
+        audit_rows = []
+        edge_rows = []
+        for ins, audit_kwargs, edge_kwargs in pending_audits:
+            audit_rows.append({**audit_kwargs, "entity_id": ins.id})
+            if edge_kwargs is not None:
+                edge_rows.append({**edge_kwargs, "target_id": ins.id})
+        try:
+            with db.begin_nested():
+                audit_repo.bulk_create(audit_rows, commit=False)
+                explanation_repo.bulk_create(edge_rows, commit=False)
+        except Exception as e:
+            logger.warning("Failed to create audit events for %d insights: %s", len(audit_rows), e)
+    if created:
+        db.commit()
 
     # Apply guardrails: filter weak insights and apply escalation rules
     # Convert Insight objects to dicts for filtering
     insights_dicts = []
     for ins in created:
-        metadata = {}
-        if ins.metadata_json:
-            if isinstance(ins.metadata_json, dict):
-                metadata = ins.metadata_json
-            else:
-                try:
-                    metadata = json.loads(ins.metadata_json)
-                except Exception:
-                    metadata = {}
+        metadata = _insight_metadata(ins)
         
         # Extract effect_size from evidence (may be in different places)
         effect_size = metadata.get("effect_size", 0.0)
@@ -592,6 +687,19 @@ def run_loop(db: Session, user_id: int) -> dict:
     
     # Update status for weak signals, apply duplicate suppression, then enforce daily cap by confidence.
     candidates: list = []
+    weak_signal_updates = 0
+    # (insight id, reason) pairs recorded as DecisionSignals in one batch after the daily cap.
+    suppressions: list = []
+
+    # PERF: The duplicate check scans the same recent-insight window for every candidate;
+    # fetch it once. Nothing in this loop adds insights or changes their metric_key.
+    # If the prefetch fails, each check queries on its own (and fails closed on error).
+    recent_for_duplicates = None
+    if escalated:
+        try:
+            recent_for_duplicates = suppression_service.recent_insights(user_id, today)
+        except Exception as e:
+            logger.warning("Failed to prefetch recent insights for suppression: %s", e)
 
     for item in escalated:
         if "insight" not in item:
@@ -611,22 +719,16 @@ def run_loop(db: Session, user_id: int) -> dict:
 
         # Persist weak signal status (metadata) but never crash governance if parsing fails
         if item.get("status") == "weak_signal":
-            metadata = {}
-            if ins.metadata_json:
-                if isinstance(ins.metadata_json, dict):
-                    metadata = ins.metadata_json
-                else:
-                    try:
-                        metadata = json.loads(ins.metadata_json)
-                    except Exception:
-                        metadata = {}
+            metadata = _insight_metadata(ins)
             metadata["status"] = "weak_signal"
-            ins.metadata_json = json.dumps(metadata)
-            db.commit()
+            ins.metadata_json = json_codec.dumps(metadata)
+            weak_signal_updates += 1
 
         # Duplicate suppression (fail-closed on errors)
         try:
-            should_suppress, reason = suppression_service.should_suppress_insight(user_id, ins, today=today)
+            should_suppress, reason = suppression_service.should_suppress_insight(
+                user_id, ins, today=today, recent=recent_for_duplicates
+            )
         except Exception as e:
             logger.error(
                 "suppression_check_failed_drop_output",
@@ -642,42 +744,42 @@ def run_loop(db: Session, user_id: int) -> dict:
             continue
 
         if should_suppress:
-            logger.info(f"Suppressing insight {ins.id}: {reason}")
-            try:
-                suppression_service.mark_suppressed(
-                    user_id=user_id,
-                    source_type="insight",
-                    source_id=ins.id,
-                    reason=reason or "suppressed",
-                )
-            except Exception:
-                # Best-effort; suppression recording failure should still not surface the item.
-                pass
+            logger.info("Suppressing insight %s: %s", ins.id, reason)
+            suppressions.append((ins.id, reason or "suppressed"))
             suppressed_count += 1
             continue
 
         candidates.append(ins)
 
+    # PERF: Weak-signal metadata edits are persisted with one commit rather than one per insight.
+    if weak_signal_updates:
+        db.commit()
+
     # Enforce daily cap: allow only the highest-confidence N (low confidence suppressed first).
     remaining_slots = max(0, suppression_service.MAX_DAILY_INSIGHTS - existing_today_pre_run)
 
-    candidates.sort(key=lambda x: float(getattr(x, "confidence_score", 0.0) or 0.0), reverse=True)
-
-    final_insights = candidates[:remaining_slots]
-    to_suppress = candidates[remaining_slots:]
+    # PERF: Partial selection of the top remaining_slots instead of a full sort
+    # (heapq.nlargest keeps sorted(..., reverse=True)[:n] ordering, ties included).
+    final_insights = heapq.nlargest(
+        remaining_slots,
+        candidates,
+        key=lambda x: float(getattr(x, "confidence_score", 0.0) or 0.0),
+    )
+    surfaced_ids = {id(ins) for ins in final_insights}
+    to_suppress = [ins for ins in candidates if id(ins) not in surfaced_ids]
+    cap_reason = f"Daily cap reached ({suppression_service.MAX_DAILY_INSIGHTS}), suppressing lower-confidence"
     for ins in to_suppress:
         suppressed_count += 1
-        try:
-            suppression_service.mark_suppressed(
-                user_id=user_id,
-                source_type="insight",
-                source_id=ins.id,
-                reason=f"Daily cap reached ({suppression_service.MAX_DAILY_INSIGHTS}), suppressing lower-confidence",
-            )
-        except Exception:
-            pass
+        suppressions.append((ins.id, cap_reason))
+
+    # PERF: One commit for every suppression record instead of one per suppressed insight.
+    try:
+        suppression_service.mark_suppressed_many(user_id=user_id, source_type="insight", entries=suppressions)
+    except Exception:
+        # Best-effort; suppression recording failure should still not surface the items.
+        db.rollback()
     
-    logger.info(f"Loop complete: {len(final_insights)} insights surfaced, {suppressed_count} suppressed")
+    logger.info("Loop complete: %d insights surfaced, %d suppressed", len(final_insights), suppressed_count)
 
     # Domain-level status (metadata only): classify "intentional silence" per domain.
     # IMPORTANT: This is NOT used for decisions, suppression, or ranking.
@@ -686,28 +788,33 @@ def run_loop(db: Session, user_id: int) -> dict:
     domain_statuses_payload = {k.value: v.value for k, v in domain_statuses.items()}
 
     # AUDITABILITY: record computed statuses for provenance (non-user-facing).
+    # PERF: The trail is a change log, not a per-run log. A run whose statuses equal the user's
+    # latest recorded ones adds no row. The statuses at time T are those of the latest entry with
+    # created_at <= T. Runs that changed nothing leave no trace, so the trail shows when
+    # statuses changed, not every time they were computed.
     try:
-        audit_repo.create(
-            user_id=user_id,
-            entity_type="domain_status",
-            entity_id=user_id,  # stable per-user entity id (allows history via created_at)
-            decision_type="computed",
-            decision_reason="Computed domain status (silence classification)",
-            source_metrics=[],
-            time_windows=None,
-            detectors_used=["domain_status"],
-            thresholds_crossed=[],
-            safety_checks_applied=[],
-            metadata={
-                "computed_at": computed_at,
-                "domain_statuses": domain_statuses_payload,
-            },
-        )
+        if _domain_statuses_changed(audit_repo, user_id, domain_statuses_payload):
+            audit_repo.create(
+                user_id=user_id,
+                entity_type="domain_status",
+                entity_id=user_id,  # stable per-user entity id (change history via created_at)
+                decision_type="computed",
+                decision_reason="Computed domain status (silence classification)",
+                source_metrics=[],
+                time_windows=None,
+                detectors_used=["domain_status"],
+                thresholds_crossed=[],
+                safety_checks_applied=[],
+                metadata={
+                    "computed_at": computed_at,
+                    "domain_statuses": domain_statuses_payload,
+                },
+            )
     except Exception:
         # Best-effort only; domain status must never break the loop.
         pass
     
-    return {
+    result = {
         "created": len(final_insights),
         "suppressed": suppressed_count,
         "items": final_insights,
@@ -715,6 +822,9 @@ def run_loop(db: Session, user_id: int) -> dict:
         "domain_statuses": domain_statuses_payload,
         "domain_status_computed_at": computed_at,
     }
+    if daily_cap_reached:
+        result["skipped"] = "daily_cap"
+    return result
 
 
 # Legacy function for backward compatibility
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import logging
+import re
+from functools import lru_cache
 from typing import Optional
 from sqlalchemy.orm import Session
 
@@ -10,6 +12,27 @@ from app.domain.repositories.causal_memory_repository import CausalMemoryReposit
 
 logger = logging.getLogger(__name__)
 
+# Driver types in priority order; a key matches when it contains any keyword as a substring.
+# Keys that match none (including caffeine/alcohol/meditation/stress) are "behavior".
+_DRIVER_TYPE_PATTERNS = tuple(
+    (driver_type, re.compile("|".join(map(re.escape, keywords))))
+    for driver_type, keywords in (
+        ("supplement", ("vitamin", "supplement", "magnesium", "melatonin", "omega")),
+        ("sleep", ("sleep", "bedtime", "wake")),
+        ("exercise", ("exercise", "workout", "run", "gym")),
+    )
+)
+
+
+@lru_cache(maxsize=1024)
+def _classify_driver_key(key: str) -> str:
+    """Driver type for an intervention key (keys repeat across evaluations, so cached)."""
+    key_lower = key.lower()
+    for driver_type, pattern in _DRIVER_TYPE_PATTERNS:
+        if pattern.search(key_lower):
+            return driver_type
+    return "behavior"  # Default
+
 
 class CausalMemoryUpdater:
     """
@@ -143,18 +166,7 @@ class CausalMemoryUpdater:
     
     def _infer_driver_type(self, intervention: Intervention) -> str:
         """Infer driver type from intervention"""
-        key_lower = intervention.key.lower()
-        
-        if any(x in key_lower for x in ["vitamin", "supplement", "magnesium", "melatonin", "omega"]):
-            return "supplement"
-        elif any(x in key_lower for x in ["sleep", "bedtime", "wake"]):
-            return "sleep"
-        elif any(x in key_lower for x in ["exercise", "workout", "run", "gym"]):
-            return "exercise"
-        elif any(x in key_lower for x in ["caffeine", "alcohol", "meditation", "stress"]):
-            return "behavior"
-        else:
-            return "behavior"  # Default
+        return _classify_driver_key(intervention.key)
     
     def _verdict_to_direction(self, verdict: str) -> str:
         """Convert evaluation verdict to direction"""
@@ -1,10 +1,29 @@
 from __future__ import annotations
 
-from typing import List, Any, Dict
+from typing import List, Any, Dict, Optional, Tuple
 from sqlalchemy.orm import Session
 
 from app.domain.repositories.personal_health_model_repository import PersonalHealthModelRepository
 from app.domain.models.evaluation_result import EvaluationResult
+from app.engine.attribution.attribution_types import AttributionResult
+
+
+def _attribution_fields(attr: Any) -> Tuple[Optional[str], Any, float, float, int]:
+    """
+    (metric, intervention, effect_size, confidence, lag_days) for one attribution.
+
+    AttributionResult fields are read directly; other producers (e.g. PersonalDriver,
+    which uses outcome_metric/driver_key) go through the getattr fallbacks.
+    """
+    if isinstance(attr, AttributionResult):
+        return attr.metric_key, attr.intervention_id, attr.effect_size, attr.confidence, attr.lag_days
+    return (
+        getattr(attr, "metric_key", None) or getattr(attr, "outcome_metric", None),
+        getattr(attr, "intervention_id", None) or getattr(attr, "driver_key", None),
+        getattr(attr, "effect_size", 0.0),
+        getattr(attr, "confidence", 0.0),
+        getattr(attr, "lag_days", 0),
+    )
 
 
 class PersonalModelUpdater:
@@ -35,71 +54,35 @@ class PersonalModelUpdater:
         """
         model = self.repo.get_or_create(user_id)
 
+        # Resolve each attribution's fields once: (metric, intervention, effect_size, confidence, lag_days)
+        normalized = [_attribution_fields(attr) for attr in attribution_results]
+        linked = [entry for entry in normalized if entry[0] and entry[1]]
+
         # Update sensitivities from attribution results
-        for attr in attribution_results:
-            metric = getattr(attr, "metric_key", None) or getattr(attr, "outcome_metric", None)
-            intervention = getattr(attr, "intervention_id", None) or getattr(attr, "driver_key", None)
-            effect_size = getattr(attr, "effect_size", 0.0)
-            confidence = getattr(attr, "confidence", 0.0)
-
-            if not metric or not intervention:
-                continue
-
-            if not model.sensitivities_json:
-                model.sensitivities_json = {}
-            
-            if intervention not in model.sensitivities_json:
-                model.sensitivities_json[intervention] = {}
-            
-            model.sensitivities_json[intervention][metric] = {
+        if linked and not model.sensitivities_json:
+            model.sensitivities_json = {}
+        for metric, intervention, effect_size, confidence, _ in linked:
+            model.sensitivities_json.setdefault(intervention, {})[metric] = {
                 "effect_size": float(effect_size),
                 "confidence": float(confidence),
             }
 
-        # Update drivers (rank by effect magnitude)
-        if attribution_results:
-            sorted_drivers = sorted(
-                attribution_results,
-                key=lambda x: abs(getattr(x, "effect_size", 0.0)),
-                reverse=True
-            )
-
+        if normalized:
+            # Update drivers (rank by effect magnitude)
+            sorted_drivers = sorted(normalized, key=lambda entry: abs(entry[2]), reverse=True)
             model.drivers_json = {
-                "primary": [
-                    getattr(d, "intervention_id", None) or getattr(d, "driver_key", None)
-                    for d in sorted_drivers[:2]
-                    if getattr(d, "intervention_id", None) or getattr(d, "driver_key", None)
-                ],
-                "secondary": [
-                    getattr(d, "intervention_id", None) or getattr(d, "driver_key", None)
-                    for d in sorted_drivers[2:5]
-                    if getattr(d, "intervention_id", None) or getattr(d, "driver_key", None)
-                ],
+                "primary": [entry[1] for entry in sorted_drivers[:2] if entry[1]],
+                "secondary": [entry[1] for entry in sorted_drivers[2:5] if entry[1]],
             }
 
-        # Update confidence (average of attribution confidences)
-        if attribution_results:
-            model.confidence_score = min(
-                1.0,
-                sum(getattr(a, "confidence", 0.0) for a in attribution_results) / max(len(attribution_results), 1)
-            )
+            # Update confidence (average of attribution confidences)
+            model.confidence_score = min(1.0, sum(entry[3] for entry in normalized) / len(normalized))
 
         # Update response patterns (lagged effects)
-        if not model.response_patterns_json:
-            model.response_patterns_json = {}
-        
-        if "lagged_effects" not in model.response_patterns_json:
-            model.response_patterns_json["lagged_effects"] = {}
-        
-        for attr in attribution_results:
-            intervention = getattr(attr, "intervention_id", None) or getattr(attr, "driver_key", None)
-            metric = getattr(attr, "metric_key", None) or getattr(attr, "outcome_metric", None)
-            lag_days = getattr(attr, "lag_days", 0)
-            
-            if intervention and metric:
-                if intervention not in model.response_patterns_json["lagged_effects"]:
-                    model.response_patterns_json["lagged_effects"][intervention] = {}
-                model.response_patterns_json["lagged_effects"][intervention][metric] = lag_days
+        response_patterns = model.response_patterns_json = model.response_patterns_json or {}
+        lagged_effects = response_patterns.setdefault("lagged_effects", {})
+        for metric, intervention, _, _, lag_days in linked:
+            lagged_effects.setdefault(intervention, {})[metric] = lag_days
 
         self.repo.update(model)
         return model
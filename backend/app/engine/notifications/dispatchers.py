@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-import json
 from typing import Dict, Any
 
+from app.utils import json_codec
+
 """
 MVP dispatchers:
 
@@ -18,7 +19,7 @@ Later you can add:
 def dispatch_console(payload_json: str) -> None:
     payload: Dict[str, Any] = {}
     try:
-        payload = json.loads(payload_json or "{}")
+        payload = json_codec.loads(payload_json or "{}")
     except Exception:
         payload = {"raw": payload_json}
     print(f"[NOTIFY][console] {payload}")
@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-import json
 from datetime import date
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List
 
 from sqlalchemy.orm import Session
 
@@ -34,12 +33,19 @@ class NotificationService:
         dedupe_key: Optional[str] = None,
     ) -> None:
         # Optional dedupe through outbox, even if we only dispatch to inbox.
-        # This makes "create" idempotent across scheduler runs.
-        if dedupe_key:
-            existing = self.outbox.exists_by_dedupe_key(dedupe_key)
-            if existing:
-                return
+        # This makes "create" idempotent across scheduler runs: the outbox insert is
+        # skipped when the dedupe_key exists, and then no inbox item is created either.
+        outbox_id = self.outbox.enqueue_if_new(
+            user_id=user_id,
+            channel="inbox",
+            notification_type=category,
+            payload={"title": title, "body": body, "metadata": metadata or {}},
+            dedupe_key=dedupe_key,
+        )
+        if outbox_id is None:
+            return
 
+        # Commits the outbox row above along with the inbox item
         self.inbox.create(
             user_id=user_id,
             category=category,
@@ -47,23 +53,68 @@ class NotificationService:
             body=body,
             metadata=metadata or {},
         )
-        self.outbox.enqueue(
-            user_id=user_id,
-            channel="inbox",
-            notification_type=category,
-            payload_json=json.dumps({"title": title, "body": body, "metadata": metadata or {}}),
-            dedupe_key=dedupe_key,
+
+    def create_inbox_only_batch(self, items: List[Dict[str, Any]]) -> int:
+        """
+        Batch form of create_inbox_only().
+
+        Each item takes create_inbox_only()'s keyword arguments. The outbox rows are
+        written in one INSERT ... ON CONFLICT (dedupe_key) DO NOTHING batch. Inbox
+        rows are created only for the outbox rows actually inserted, in one more
+        INSERT batch, and everything is committed together. Returns the number created.
+        """
+        # Repeated keys within the batch: only the first item counts
+        batch_keys: set = set()
+        unique: List[Dict[str, Any]] = []
+        for item in items:
+            dedupe_key = item.get("dedupe_key")
+            if dedupe_key:
+                if dedupe_key in batch_keys:
+                    continue
+                batch_keys.add(dedupe_key)
+            unique.append(item)
+        if not unique:
+            return 0
+
+        inserted = set(
+            self.outbox.bulk_enqueue(
+                [
+                    {
+                        "user_id": item["user_id"],
+                        "channel": "inbox",
+                        "notification_type": item["category"],
+                        "payload": {"title": item["title"], "body": item["body"], "metadata": item.get("metadata") or {}},
+                        "dedupe_key": item.get("dedupe_key"),
+                    }
+                    for item in unique
+                ]
+            )
         )
+        fresh = [item for item in unique if (item["user_id"], item.get("dedupe_key")) in inserted]
+        if not fresh:
+            return 0
+        # Commits the outbox rows above along with the inbox rows
+        self.inbox.bulk_create(fresh)
+        return len(fresh)
+
+    @staticmethod
+    def _daily_checkin_reminder(user_id: int, checkin_date: date) -> Dict[str, Any]:
+        return {
+            "user_id": user_id,
+            "category": "reminder",
+            "title": "Daily check-in",
+            "body": "Log sleep quality, energy, mood, stress, and any supplements/behaviours so we can track what works.",
+            "metadata": {"checkin_date": checkin_date.isoformat()},
+            "dedupe_key": f"checkin_reminder:{user_id}:{checkin_date.isoformat()}",
+        }
 
     def daily_checkin_reminder(self, user_id: int, checkin_date: date) -> None:
-        key = f"checkin_reminder:{user_id}:{checkin_date.isoformat()}"
-        self.create_inbox_only(
-            user_id=user_id,
-            category="reminder",
-            title="Daily check-in",
-            body="Log sleep quality, energy, mood, stress, and any supplements/behaviours so we can track what works.",
-            metadata={"checkin_date": checkin_date.isoformat()},
-            dedupe_key=key,
+        self.create_inbox_only(**self._daily_checkin_reminder(user_id, checkin_date))
+
+    def daily_checkin_reminders(self, user_ids: Iterable[int], checkin_date: date) -> int:
+        """Daily check-in reminders for many users in one batch; returns the number created."""
+        return self.create_inbox_only_batch(
+            [self._daily_checkin_reminder(user_id, checkin_date) for user_id in user_ids]
         )
 
     def experiment_due_evaluation(self, user_id: int, experiment_id: int) -> None:
@@ -1,16 +1,21 @@
 from __future__ import annotations
 
-import json
 import logging
 import uuid
-from datetime import datetime
-from typing import Optional, List, Dict, Any
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, Set, Tuple
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.providers.whoop.whoop_adapter import WhoopAdapter
 from app.providers.base import NormalizedPoint
-from app.domain.metric_registry import get_metric_spec, METRICS
+from app.domain.metric_registry import MetricSpec, get_metric_spec, METRICS
+from app.domain.unit_conversion import (
+    validate_unit_compatibility,
+    convert_unit,
+    UnitConversionError,
+)
 from app.domain.repositories.health_data_repository import HealthDataRepository
 from app.domain.models.health_data_point import HealthDataPoint
 from app.domain.models.data_provenance import DataProvenance
@@ -19,6 +24,9 @@ from app.core.invariants import validate_provider_ingestion_invariants, Invarian
 
 logger = logging.getLogger(__name__)
 
+# Rows per executemany INSERT when writing health data points
+INSERT_BATCH_SIZE = 5000
+
 
 class ProviderSyncService:
     def __init__(self, db: Session):
@@ -39,12 +47,12 @@ class ProviderSyncService:
         from app.domain.repositories.consent_repository import ConsentRepository
         consent_repo = ConsentRepository(self.db)
         
-        if not consent_repo.is_consent_valid(user_id=user_id, provider="whoop"):
+        consent = consent_repo.get_latest(user_id)
+        if not consent_repo.consent_allows(consent, provider="whoop"):
             logger.warning(
                 f"WHOOP sync blocked for user_id={user_id}: consent not valid "
                 f"(missing, revoked, or WHOOP ingestion consent not granted)"
             )
-            consent = consent_repo.get_latest(user_id)
             if consent and consent.revoked_at:
                 return {
                     "provider": "whoop",
@@ -67,9 +75,9 @@ class ProviderSyncService:
                     "errors": [{"reason": "consent_required", "message": "User consent is required for WHOOP data ingestion"}]
                 }
         
-        # Generate unique ingestion run ID
-        ingestion_run_id = f"whoop_{user_id}_{datetime.utcnow().isoformat()}_{uuid.uuid4().hex[:8]}"
+        # Generate unique ingestion run ID (stamped with the same time as the provenance rows)
         ingestion_time = datetime.utcnow()
+        ingestion_run_id = f"whoop_{user_id}_{ingestion_time.isoformat()}_{uuid.uuid4().hex[:8]}"
         
         try:
             adapter = WhoopAdapter(self.db)
@@ -81,29 +89,40 @@ class ProviderSyncService:
 
         # STEP R: Compute quality score for batch
         quality_service = DataQualityService()
-        metric_specs = {k: v for k, v in METRICS.items()}
         quality_score = quality_service.compute_quality_score(
             points=pts,
-            metric_specs=metric_specs,
+            metric_specs=METRICS,
             ingestion_time=ingestion_time,
         )
+        # The score is per batch: every row shares one dict and one flag decision
+        quality_score_dict = quality_score.to_dict()
+        # Determine if points should be flagged (quality < 0.6)
+        is_flagged = quality_score.overall < 0.6
 
         inserted = 0
         rejected = 0
         errors = []
-        existing_timestamps: Dict[str, List[datetime]] = {}  # Track duplicates per metric
+        existing_timestamps: Dict[str, Set[datetime]] = {}  # Track duplicates per metric
+        spec_cache: Dict[str, MetricSpec] = {}
+        # (metric_type, provided_unit) -> (is_compatible, error_msg, needs_conversion);
+        # provider units are stable per metric, so this is computed once per pair
+        unit_checks: Dict[Tuple[str, str], Tuple[bool, Optional[str], bool]] = {}
 
         # Safety: Validate all points before any insertion (never partially ingest)
         to_create = []
-        provenances = []  # Track provenance records
+        # One provenance row per distinct WHOOP record; points from the same sleep or
+        # recovery record share it.
+        provenance_by_record: Dict[Optional[str], Dict[str, Any]] = {}
         
         for p in pts:
             # Track timestamps for duplicate detection
             if p.metric_type not in existing_timestamps:
-                existing_timestamps[p.metric_type] = []
+                existing_timestamps[p.metric_type] = set()
             
             try:
-                spec = get_metric_spec(p.metric_type)
+                spec = spec_cache.get(p.metric_type)
+                if spec is None:
+                    spec = spec_cache[p.metric_type] = get_metric_spec(p.metric_type)
                 
                 # X1: Validate invariants (metric registry, unit, range)
                 try:
@@ -121,22 +140,23 @@ class ProviderSyncService:
                     continue
                 
                 # SECURITY FIX (Risk #6): Validate and convert units
-                from app.domain.unit_conversion import (
-                    validate_unit_compatibility,
-                    convert_unit,
-                    UnitConversionError,
-                )
-                from datetime import timezone
-                
                 provided_unit = p.unit or spec.unit
                 canonical_unit = spec.unit
                 
                 # Validate unit compatibility
-                is_compatible, error_msg, _ = validate_unit_compatibility(
-                    provided_unit=provided_unit,
-                    expected_unit=canonical_unit,
-                    metric_key=p.metric_type,
-                )
+                unit_check = unit_checks.get((p.metric_type, provided_unit))
+                if unit_check is None:
+                    is_compatible, error_msg, _ = validate_unit_compatibility(
+                        provided_unit=provided_unit,
+                        expected_unit=canonical_unit,
+                        metric_key=p.metric_type,
+                    )
+                    unit_check = unit_checks[(p.metric_type, provided_unit)] = (
+                        is_compatible,
+                        error_msg,
+                        provided_unit.lower() != canonical_unit.lower(),
+                    )
+                is_compatible, error_msg, needs_conversion = unit_check
                 
                 if not is_compatible:
                     rejected += 1
@@ -149,7 +169,7 @@ class ProviderSyncService:
                 
                 # Convert value if units differ
                 value = p.value
-                if provided_unit.lower() != canonical_unit.lower():
+                if needs_conversion:
                     try:
                         value = convert_unit(
                             value=p.value,
@@ -166,15 +186,11 @@ class ProviderSyncService:
                         continue
                 
                 # SECURITY FIX (Risk #6): Ensure timestamp is UTC and timezone-naive for storage
+                # Timezone-naive timestamps are already treated as UTC and stored as-is;
+                # aware ones are converted to UTC, then the tzinfo is dropped for storage
                 timestamp = p.timestamp
-                if timestamp.tzinfo is None:
-                    # Assume UTC if timezone-naive
-                    timestamp = timestamp.replace(tzinfo=timezone.utc)
-                else:
-                    # Convert to UTC if timezone-aware
-                    timestamp = timestamp.astimezone(timezone.utc)
-                # Remove timezone for database storage
-                timestamp = timestamp.replace(tzinfo=None)
+                if timestamp.tzinfo is not None:
+                    timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
                 
                 # STEP R: Quality gates (hard stops)
                 should_reject, reject_reason = quality_service.should_reject_point(
@@ -189,40 +205,37 @@ class ProviderSyncService:
                     continue
                 
                 # Add timestamp to tracking
-                existing_timestamps[p.metric_type].append(timestamp)
+                existing_timestamps[p.metric_type].add(quality_service.duplicate_key(timestamp))
                 
-                # STEP R: Create provenance record
-                provenance = DataProvenance(
-                    user_id=user_id,
-                    source_type="wearable",
-                    source_name="whoop",
-                    source_record_id=p.metadata.get("whoop_sleep_id") or p.metadata.get("whoop_recovery_id"),
-                    ingestion_run_id=ingestion_run_id,
-                    received_at=ingestion_time,
-                    is_validated=True,
-                    validation_errors=None,
-                    quality_score=quality_score.to_dict(),
-                )
-                self.db.add(provenance)
-                self.db.flush()  # Get provenance.id
-                provenances.append(provenance)
-                
-                # Determine if point should be flagged (quality < 0.6)
-                is_flagged = quality_score.overall < 0.6
-                
-                to_create.append(
-                    {
+                # The row carries its WHOOP record id until insert time, when it is
+                # swapped for the id of the provenance row inserted for that record
+                row = {
+                    "user_id": user_id,
+                    "metric_type": p.metric_type,
+                    "value": float(value),  # Use converted value
+                    "unit": canonical_unit,  # Always store canonical unit
+                    "timestamp": timestamp,  # Use timezone-safe timestamp
+                    "source": p.source,
+                    "quality_score": quality_score_dict,
+                    "is_flagged": is_flagged,
+                    "source_record_id": p.metadata.get("whoop_sleep_id") or p.metadata.get("whoop_recovery_id"),
+                }
+
+                # STEP R: Provenance record (inserted in bulk with the points below)
+                source_record_id = row["source_record_id"]
+                if source_record_id not in provenance_by_record:
+                    provenance_by_record[source_record_id] = {
                         "user_id": user_id,
-                        "data_type": p.metric_type,
-                        "value": float(value),  # Use converted value
-                        "unit": canonical_unit,  # Always store canonical unit
-                        "timestamp": timestamp,  # Use timezone-safe timestamp
-                        "source": p.source,
-                        "data_provenance_id": provenance.id,
-                        "quality_score": quality_score.to_dict(),
-                        "is_flagged": is_flagged,
+                        "source_type": "wearable",
+                        "source_name": "whoop",
+                        "source_record_id": source_record_id,
+                        "ingestion_run_id": ingestion_run_id,
+                        "received_at": ingestion_time,
+                        "is_validated": True,
+                        "validation_errors": None,
+                        "quality_score": quality_score_dict,
                     }
-                )
+                to_create.append(row)
             except Exception as e:
                 rejected += 1
                 errors.append({"metric_type": p.metric_type, "reason": "exception", "error": str(e)})
@@ -230,21 +243,20 @@ class ProviderSyncService:
         # Safety: Only commit if we have valid points to insert (never partially ingest)
         if to_create:
             try:
+                # Insert provenance rows in one statement; RETURNING hands back the ids
+                # in parameter order so they line up with provenance_by_record.
+                provenance_ids = self.db.scalars(
+                    insert(DataProvenance).returning(DataProvenance.id, sort_by_parameter_order=True),
+                    list(provenance_by_record.values()),
+                ).all()
+                id_by_record = dict(zip(provenance_by_record, provenance_ids))
                 for row in to_create:
-                    # Use HealthDataPoint model directly (metric_type maps to data_type column)
-                    point = HealthDataPoint(
-                        user_id=row["user_id"],
-                        metric_type=row["data_type"],
-                        value=row["value"],
-                        unit=row["unit"],
-                        timestamp=row["timestamp"],
-                        source=row["source"],
-                        data_provenance_id=row["data_provenance_id"],
-                        quality_score=row["quality_score"],
-                        is_flagged=row["is_flagged"],
-                    )
-                    self.db.add(point)
-                    inserted += 1
+                    row["data_provenance_id"] = id_by_record[row.pop("source_record_id")]
+                # Core insert against the table: plain executemany, no ORM bulk-insert bookkeeping
+                point_table = HealthDataPoint.__table__
+                for start in range(0, len(to_create), INSERT_BATCH_SIZE):
+                    self.db.execute(insert(point_table), to_create[start:start + INSERT_BATCH_SIZE])
+                inserted = len(to_create)
                 self.db.commit()
                 logger.info(f"WHOOP sync for user_id={user_id}: inserted={inserted}, rejected={rejected}, quality={quality_score.overall}")
             except Exception as e:
@@ -259,6 +271,6 @@ class ProviderSyncService:
             "rejected": rejected,
             "errors": errors,
             "ingestion_run_id": ingestion_run_id,
-            "quality_score": quality_score.to_dict(),
+            "quality_score": quality_score_dict,
         }
 
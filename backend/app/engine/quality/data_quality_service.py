@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Any, Optional, Set
 from dataclasses import dataclass
 
+import numpy as np
+
 from app.providers.base import NormalizedPoint
 
 logger = logging.getLogger(__name__)
@@ -31,6 +33,77 @@ class DataQualityScore:
         }
 
 
+# Weights of each dimension in the overall score (completeness and consistency are most important)
+_DIMENSION_WEIGHTS = {
+    "completeness": 0.3,
+    "consistency": 0.3,
+    "timeliness": 0.15,
+    "stability": 0.15,
+    "duplication": 0.10,
+}
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_MISSING_TS = np.iinfo(np.int64).min  # Placeholder for a missing timestamp
+
+# Timeliness cutoff: data older than this at ingestion is not timely
+_TIMELY_AGE_US = 7 * 86400 * 10**6
+
+
+def _epoch_us(ts: Optional[datetime]) -> int:
+    """Microseconds since the epoch; naive timestamps are taken as UTC."""
+    if ts is None:
+        return _MISSING_TS
+    return (ts - (_EPOCH if ts.tzinfo is None else _EPOCH_UTC)) // _MICROSECOND
+
+
+@dataclass
+class _PointArrays:
+    """
+    Struct-of-arrays view of a point batch, built once and shared by the scorers.
+
+    Metric types and units are integer codes into metric_types / units.
+    """
+    metric_types: List[str]
+    metric_codes: np.ndarray  # int64
+    units: List[Optional[str]]
+    unit_codes: np.ndarray  # int64
+    values: np.ndarray  # float64, NaN where value is None
+    has_value: np.ndarray  # bool
+    timestamps_us: np.ndarray  # int64 epoch microseconds
+    present_fields: int  # Completeness numerator over the five expected fields
+
+    @classmethod
+    def from_points(cls, points: List[NormalizedPoint]) -> "_PointArrays":
+        metric_code_of: Dict[str, int] = {}
+        unit_code_of: Dict[Optional[str], int] = {}
+        metric_codes: List[int] = []
+        unit_codes: List[int] = []
+        values: List[float] = []
+        has_value: List[bool] = []
+        timestamps_us: List[int] = []
+        present = 0
+        for p in points:
+            metric_codes.append(metric_code_of.setdefault(p.metric_type, len(metric_code_of)))
+            unit_codes.append(unit_code_of.setdefault(p.unit, len(unit_code_of)))
+            value_present = p.value is not None
+            has_value.append(value_present)
+            values.append(p.value if value_present else np.nan)
+            timestamps_us.append(_epoch_us(p.timestamp))
+            present += bool(p.metric_type) + value_present + bool(p.unit) + bool(p.timestamp) + bool(p.source)
+        return cls(
+            metric_types=list(metric_code_of),
+            metric_codes=np.array(metric_codes, dtype=np.int64),
+            units=list(unit_code_of),
+            unit_codes=np.array(unit_codes, dtype=np.int64),
+            values=np.array(values, dtype=np.float64),
+            has_value=np.array(has_value, dtype=bool),
+            timestamps_us=np.array(timestamps_us, dtype=np.int64),
+            present_fields=present,
+        )
+
+
 class DataQualityService:
     """
     Data Quality Scoring Engine.
@@ -54,121 +127,131 @@ class DataQualityService:
         Completeness: % expected fields present.
         Expected fields: metric_type, value, unit, timestamp, source
         """
-        if not points:
-            return 0.0
-        
-        total_fields = len(points) * 5  # 5 expected fields per point
-        present_fields = 0
-        
-        for p in points:
-            if p.metric_type:
-                present_fields += 1
-            if p.value is not None:
-                present_fields += 1
-            if p.unit:
-                present_fields += 1
-            if p.timestamp:
-                present_fields += 1
-            if p.source:
-                present_fields += 1
-        
-        return present_fields / total_fields if total_fields > 0 else 0.0
+        return self._score_completeness(_PointArrays.from_points(points))
     
     def score_consistency(self, points: List[NormalizedPoint], metric_specs: Dict[str, Any]) -> float:
         """
         Consistency: unit & range adherence.
         Checks if units match expected and values are within valid ranges.
         """
-        if not points:
-            return 0.0
-        
-        consistent = 0
-        for p in points:
-            try:
-                spec = metric_specs.get(p.metric_type)
-                if not spec:
-                    continue  # Skip if no spec (will be rejected elsewhere)
-                
-                # Unit check
-                if p.unit != spec.unit:
-                    continue
-                
-                # Range check
-                if spec.min_value is not None and p.value < spec.min_value:
-                    continue
-                if spec.max_value is not None and p.value > spec.max_value:
-                    continue
-                
-                consistent += 1
-            except Exception:
-                continue
-        
-        return consistent / len(points) if points else 0.0
+        return self._score_consistency(_PointArrays.from_points(points), metric_specs)
     
     def score_timeliness(self, points: List[NormalizedPoint], ingestion_time: datetime) -> float:
         """
         Timeliness: delay from event → ingestion.
         Penalizes data that is too old (e.g., > 7 days old).
         """
-        if not points:
-            return 0.0
-        
-        timely = 0
-        for p in points:
-            age_days = (ingestion_time - p.timestamp).total_seconds() / 86400
-            # Data < 7 days old is considered timely
-            if age_days <= 7:
-                timely += 1
-        
-        return timely / len(points) if points else 0.0
+        return self._score_timeliness(_PointArrays.from_points(points), ingestion_time)
     
     def score_stability(self, points: List[NormalizedPoint]) -> float:
         """
         Stability: abnormal variance spikes.
         Checks for sudden large changes that might indicate data errors.
         """
-        if len(points) < 2:
-            return 1.0  # Can't assess stability with < 2 points
-        
-        # Sort by timestamp
-        sorted_points = sorted(points, key=lambda p: p.timestamp)
-        
-        # Calculate relative changes
-        changes = []
-        for i in range(1, len(sorted_points)):
-            if sorted_points[i-1].value == 0:
-                continue
-            change = abs((sorted_points[i].value - sorted_points[i-1].value) / sorted_points[i-1].value)
-            changes.append(change)
-        
-        if not changes:
-            return 1.0
-        
-        # If > 50% change, flag as potentially unstable
-        # Score decreases as more points have large changes
-        stable_count = sum(1 for c in changes if c <= 0.5)
-        return stable_count / len(changes) if changes else 1.0
+        return self._score_stability(_PointArrays.from_points(points))
     
     def score_duplication(self, points: List[NormalizedPoint]) -> float:
         """
         Duplication: repeated timestamps.
         Penalizes duplicate timestamps (same metric, same timestamp).
         """
-        if not points:
+        return self._score_duplication(_PointArrays.from_points(points))
+
+    @staticmethod
+    def _score_completeness(arrays: _PointArrays) -> float:
+        n = len(arrays.values)
+        if not n:
+            return 0.0
+        return arrays.present_fields / (n * 5)  # 5 expected fields per point
+
+    @staticmethod
+    def _score_consistency(arrays: _PointArrays, metric_specs: Dict[str, Any]) -> float:
+        n = len(arrays.values)
+        if not n or not metric_specs:
+            return 0.0
+
+        # Per-metric lookup tables indexed by metric code
+        n_codes = len(arrays.metric_types)
+        has_spec = np.zeros(n_codes, dtype=bool)
+        mins = np.full(n_codes, np.nan)
+        maxs = np.full(n_codes, np.nan)
+        spec_unit_codes = np.full(n_codes, -1, dtype=np.int64)
+        unit_code_of = {unit: code for code, unit in enumerate(arrays.units)}
+        for code, metric_type in enumerate(arrays.metric_types):
+            spec = metric_specs.get(metric_type)
+            if not spec:
+                continue  # Skip if no spec (will be rejected elsewhere)
+            has_spec[code] = True
+            spec_unit_codes[code] = unit_code_of.get(spec.unit, -1)
+            if spec.min_value is not None:
+                mins[code] = spec.min_value
+            if spec.max_value is not None:
+                maxs[code] = spec.max_value
+        if not has_spec.any():
+            return 0.0  # No point has a spec, so none can be consistent
+
+        codes = arrays.metric_codes
+        unit_ok = arrays.unit_codes == spec_unit_codes[codes]
+        point_mins = mins[codes]
+        point_maxs = maxs[codes]
+        has_min = ~np.isnan(point_mins)
+        has_max = ~np.isnan(point_maxs)
+        values = arrays.values
+        with np.errstate(invalid="ignore"):
+            below = has_min & (values < point_mins)
+            above = has_max & (values > point_maxs)
+        # A missing value cannot be range-checked, so it only passes when there is no range
+        range_ok = ~below & ~above & (arrays.has_value | ~(has_min | has_max))
+
+        consistent = has_spec[codes] & unit_ok & range_ok
+        return int(np.count_nonzero(consistent)) / n
+
+    @staticmethod
+    def _score_timeliness(arrays: _PointArrays, ingestion_time: datetime) -> float:
+        n = len(arrays.timestamps_us)
+        if not n:
+            return 0.0
+        # Data < 7 days old is considered timely
+        timestamps = arrays.timestamps_us
+        age = _epoch_us(ingestion_time) - timestamps
+        timely = (age <= _TIMELY_AGE_US) & (timestamps != _MISSING_TS)
+        return int(np.count_nonzero(timely)) / n
+
+    @staticmethod
+    def _score_stability(arrays: _PointArrays) -> float:
+        if len(arrays.values) < 2:
+            return 1.0  # Can't assess stability with < 2 points
+
+        # Sort by timestamp (stable, like sorted()). Provider batches usually arrive
+        # in time order, and an O(n) check is much cheaper than the argsort + gather.
+        timestamps = arrays.timestamps_us
+        if np.all(timestamps[1:] >= timestamps[:-1]):
+            ordered = arrays.values
+        else:
+            ordered = arrays.values[np.argsort(timestamps, kind="stable")]
+        prev = ordered[:-1]
+        nonzero = prev != 0
+        if not nonzero.any():
             return 1.0
-        
-        seen = set()
-        duplicates = 0
-        
-        for p in points:
-            key = (p.metric_type, p.timestamp.isoformat())
-            if key in seen:
-                duplicates += 1
-            else:
-                seen.add(key)
-        
-        unique = len(points) - duplicates
-        return unique / len(points) if points else 1.0
+
+        # Relative change between consecutive points, skipping zero predecessors.
+        # If > 50% change, flag as potentially unstable;
+        # score decreases as more points have large changes.
+        changes = np.abs((ordered[1:][nonzero] - prev[nonzero]) / prev[nonzero])
+        return int(np.count_nonzero(changes <= 0.5)) / len(changes)
+
+    @staticmethod
+    def _score_duplication(arrays: _PointArrays) -> float:
+        n = len(arrays.values)
+        if not n:
+            return 1.0
+        # Sort by (metric, timestamp) and count rows equal to their predecessor
+        codes = arrays.metric_codes
+        timestamps = arrays.timestamps_us
+        order = np.lexsort((timestamps, codes))
+        codes, timestamps = codes[order], timestamps[order]
+        duplicates = int(np.count_nonzero((codes[1:] == codes[:-1]) & (timestamps[1:] == timestamps[:-1])))
+        return (n - duplicates) / n
     
     def compute_quality_score(
         self,
@@ -182,39 +265,47 @@ class DataQualityService:
         if ingestion_time is None:
             ingestion_time = datetime.utcnow()
         
-        completeness = self.score_completeness(points)
-        consistency = self.score_consistency(points, metric_specs)
-        timeliness = self.score_timeliness(points, ingestion_time)
-        stability = self.score_stability(points)
-        duplication = self.score_duplication(points)
+        # One conversion to arrays shared by all five dimensions
+        arrays = _PointArrays.from_points(points)
+        completeness = self._score_completeness(arrays)
+        consistency = self._score_consistency(arrays, metric_specs)
+        timeliness = self._score_timeliness(arrays, ingestion_time)
+        stability = self._score_stability(arrays)
+        duplication = self._score_duplication(arrays)
         
-        # Overall score: weighted average (completeness and consistency are most important)
-        overall = (
-            completeness * 0.3 +
-            consistency * 0.3 +
-            timeliness * 0.15 +
-            stability * 0.15 +
-            duplication * 0.10
-        )
+        scores = {
+            "completeness": completeness,
+            "consistency": consistency,
+            "timeliness": timeliness,
+            "stability": stability,
+            "duplication": duplication,
+        }
+        
+        # Overall score: weighted average (summed in _DIMENSION_WEIGHTS order)
+        overall = sum(scores[dimension] * weight for dimension, weight in _DIMENSION_WEIGHTS.items())
         
         return DataQualityScore(
             overall=round(overall, 2),
-            completeness=round(completeness, 2),
-            consistency=round(consistency, 2),
-            timeliness=round(timeliness, 2),
-            stability=round(stability, 2),
-            duplication=round(duplication, 2),
+            **{dimension: round(score, 2) for dimension, score in scores.items()},
         )
     
+    @staticmethod
+    def duplicate_key(timestamp: datetime) -> datetime:
+        """Timestamp rounded to the minute, the resolution used for duplicate detection."""
+        return timestamp.replace(second=0, microsecond=0)
+
     def should_reject_point(
         self,
         point: NormalizedPoint,
         metric_spec: Any,
-        existing_timestamps: List[datetime],
+        existing_timestamps: Set[datetime],
     ) -> tuple[bool, Optional[str]]:
         """
         Quality Gates (Hard Stops).
         
+        existing_timestamps holds the duplicate_key() of points already accepted
+        for this metric, so the duplicate check is a set lookup.
+        
         Returns (should_reject, reason) tuple.
         """
         # Missing metric spec
@@ -232,8 +323,7 @@ class DataQualityService:
             return True, f"Value above max: {point.value} > {metric_spec.max_value}"
         
         # Duplicate timestamp
-        point_ts = point.timestamp.replace(second=0, microsecond=0)  # Round to minute
-        if any(ts.replace(second=0, microsecond=0) == point_ts for ts in existing_timestamps):
+        if self.duplicate_key(point.timestamp) in existing_timestamps:
             return True, "Duplicate timestamp"
         
         return False, None
@@ -1,3 +1,9 @@
+import hashlib
+import os
+import re
+import shutil
+from functools import lru_cache
+
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.vectorstores import Chroma
 from langchain.embeddings.openai import OpenAIEmbeddings
@@ -17,6 +23,52 @@ if not settings.OPENAI_API_KEY:
         "Please add it to your .env file: OPENAI_API_KEY=your-key-here"
     )
 
+@lru_cache(maxsize=1)
+def _get_embeddings() -> OpenAIEmbeddings:
+    """
+    Process-wide embeddings client, shared by every engine so its HTTP session is reused.
+    
+    embed_documents already sends texts in batches of chunk_size (1000) per request,
+    so a cold-start build is a handful of API calls, not one per chunk.
+    """
+    return OpenAIEmbeddings()
+
+
+@lru_cache(maxsize=1)
+def _get_llm() -> ChatOpenAI:
+    """Process-wide chat client, shared by every engine so its HTTP connection pool is reused."""
+    return ChatOpenAI(
+        model_name=settings.OPENAI_MODEL,
+        temperature=settings.OPENAI_TEMPERATURE
+    )
+
+
+# Written into a store directory once Chroma.from_texts has finished, so an
+# interrupted build is never mistaken for a usable store
+_STORE_COMPLETE_MARKER = ".complete"
+
+# Name of a per-knowledge-base store directory under CHROMA_DB_PATH (see _store_directory)
+_STORE_DIR_NAME = re.compile(r"^[0-9a-f]{16}$")
+
+
+def _prune_stale_stores(root: str, keep: str) -> None:
+    """
+    Delete the store directories of earlier knowledge-base versions under root.
+
+    Only hash-named directories written by HealthRAGEngine are touched. Anything
+    else under root, such as the pre-hash flat store, is left alone.
+    """
+    try:
+        names = os.listdir(root)
+    except OSError:
+        return
+    keep_name = os.path.basename(keep)
+    for name in names:
+        path = os.path.join(root, name)
+        if name != keep_name and _STORE_DIR_NAME.match(name) and os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+
+
 class HealthRAGEngine:
     def __init__(self, knowledge_base_path: str):
         """Initialize RAG engine with knowledge base documents"""
@@ -30,22 +82,41 @@ class HealthRAGEngine:
             chunk_size=settings.RAG_CHUNK_SIZE,
             chunk_overlap=settings.RAG_CHUNK_OVERLAP
         )
-        chunks = self.text_splitter.split_text(self.knowledge_text)
         
-        # Create vector store (Chroma stores embeddings locally)
-        self.embeddings = OpenAIEmbeddings()
-        self.vectorstore = Chroma.from_texts(
-            chunks,
-            self.embeddings,
-            persist_directory=settings.CHROMA_DB_PATH
-        )
+        # Vector store (Chroma stores embeddings locally). Embedding the knowledge base
+        # is only done on a cold start; later starts load the persisted store.
+        self.embeddings = _get_embeddings()
+        persist_directory = self._store_directory(self.knowledge_text)
+        marker = os.path.join(persist_directory, _STORE_COMPLETE_MARKER)
+        if os.path.exists(marker):
+            self.vectorstore = Chroma(
+                persist_directory=persist_directory,
+                embedding_function=self.embeddings,
+            )
+        else:
+            # Drop any half-built store so its chunks are not added twice
+            shutil.rmtree(persist_directory, ignore_errors=True)
+            chunks = self.text_splitter.split_text(self.knowledge_text)
+            self.vectorstore = Chroma.from_texts(
+                chunks,
+                self.embeddings,
+                persist_directory=persist_directory
+            )
+            with open(marker, 'w') as f:
+                f.write(f"{len(chunks)}\n")
+        # Each knowledge-base change builds a new full-size store; keep only the current one
+        _prune_stale_stores(settings.CHROMA_DB_PATH, persist_directory)
         self.retriever = self.vectorstore.as_retriever(search_kwargs={"k": settings.RAG_RETRIEVER_K})
         
         # Initialize LLM
-        self.llm = ChatOpenAI(
-            model_name=settings.OPENAI_MODEL,
-            temperature=settings.OPENAI_TEMPERATURE
-        )
+        self.llm = _get_llm()
+    
+    @staticmethod
+    def _store_directory(knowledge_text: str) -> str:
+        """Persist directory keyed by the knowledge base content and chunking settings"""
+        signature = f"{settings.RAG_CHUNK_SIZE}:{settings.RAG_CHUNK_OVERLAP}:{knowledge_text}"
+        kb_hash = hashlib.sha256(signature.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(settings.CHROMA_DB_PATH, kb_hash)
     
     def format_docs(self, docs):
         """Format retrieved documents for LLM"""
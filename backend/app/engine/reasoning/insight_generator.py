@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from json import dumps
 from typing import List, Dict, Literal, Optional, Sequence
 
 from app.domain.repositories.lab_result_repository import LabResultRepository
@@ -64,20 +65,31 @@ class GeneratedInsight:
     window_days: int
 
 
-def _compute_trend(series: Sequence[DailyMetric]) -> tuple[TrendDirection, Optional[float]]:
+def _metric_summary_dict(summary: MetricSummary) -> Dict:
+    """Plain dict of a MetricSummary, same as dataclasses.asdict()."""
+    # Every field is a scalar, so a shallow copy is enough (asdict deep-copies each field)
+    return dict(summary.__dict__)
+
+
+def _series_values(series: Sequence[DailyMetric]) -> List[float]:
+    """Daily values, extracted once and shared by every reducer."""
+    return [dm.value for dm in series]
+
+
+def _mean(values: Sequence[float]) -> float:
+    return sum(values) / len(values)
+
+
+def _trend_from_values(values: List[float]) -> tuple[TrendDirection, Optional[float]]:
     """Determine simple trend by comparing early vs late averages."""
-    if len(series) < 6:  # too little to say anything
+    n = len(values)
+    if n < 6:  # too little to say anything
         return "unknown", None
 
-    values = [dm.value for dm in series]
-    n = len(values)
     third = max(1, n // 3)
 
-    first_segment = values[:third]
-    last_segment = values[-third:]
-
-    first_mean = sum(first_segment) / len(first_segment)
-    last_mean = sum(last_segment) / len(last_segment)
+    first_mean = _mean(values[:third])
+    last_mean = _mean(values[-third:])
     delta = last_mean - first_mean
 
     # simple thresholds – later you can tune.
@@ -93,14 +105,19 @@ def _compute_trend(series: Sequence[DailyMetric]) -> tuple[TrendDirection, Optio
     return direction, delta
 
 
-def _safe_latest(series: Sequence[DailyMetric]) -> Optional[float]:
-    return series[-1].value if series else None
+def _summarise(
+    values: List[float],
+) -> tuple[Optional[float], Optional[float], TrendDirection, Optional[float]]:
+    """(latest, mean, trend, trend_delta) for a series' daily values."""
+    if not values:
+        return None, None, "unknown", None
+    trend, delta = _trend_from_values(values)
+    return values[-1], _mean(values), trend, delta
 
 
-def _safe_mean(series: Sequence[DailyMetric]) -> Optional[float]:
-    if not series:
-        return None
-    return sum(dm.value for dm in series) / len(series)
+def _compute_trend(series: Sequence[DailyMetric]) -> tuple[TrendDirection, Optional[float]]:
+    """Determine simple trend by comparing early vs late averages."""
+    return _trend_from_values(_series_values(series))
 
 
 class InsightEngine:
@@ -135,25 +152,31 @@ class InsightEngine:
         unit: Optional[str],
         window_days: int,
         end: Optional[datetime] = None,
+        series: Optional[Sequence[DailyMetric]] = None,
     ) -> Optional[MetricSummary]:
-        end = end or datetime.utcnow()
-        start = end - timedelta(days=window_days)
+        """
+        Summarise a wearable metric over the window.
 
-        series = build_wearable_daily_series(
-            user_id=user_id,
-            metric_type=metric_name,
-            start=start,
-            end=end,
-            wearable_repo=self.wearable_repo,
-            aggregation="mean",
-        )
+        Pass series (daily means over the same window) when the caller has already
+        built it, to skip the repository query.
+        """
+        if series is None:
+            end = end or datetime.utcnow()
+            start = end - timedelta(days=window_days)
+
+            series = build_wearable_daily_series(
+                user_id=user_id,
+                metric_type=metric_name,
+                start=start,
+                end=end,
+                wearable_repo=self.wearable_repo,
+                aggregation="mean",
+            )
 
         if not series:
             return None
 
-        trend, delta = _compute_trend(series)
-        latest = _safe_latest(series)
-        avg = _safe_mean(series)
+        latest, avg, trend, delta = _summarise(_series_values(series))
 
         return MetricSummary(
             metric_name=metric_name,
@@ -189,9 +212,7 @@ class InsightEngine:
         if not series:
             return None
 
-        trend, delta = _compute_trend(series)
-        latest = _safe_latest(series)
-        avg = _safe_mean(series)
+        latest, avg, trend, delta = _summarise(_series_values(series))
 
         # You could look up units from ontology later; left as optional for now.
         return MetricSummary(
@@ -229,9 +250,7 @@ class InsightEngine:
         if not series:
             return None
 
-        trend, delta = _compute_trend(series)
-        latest = _safe_latest(series)
-        avg = _safe_mean(series)
+        latest, avg, trend, delta = _summarise(_series_values(series))
 
         return MetricSummary(
             metric_name=data_type,
@@ -279,13 +298,16 @@ class InsightEngine:
         self,
         user_id: int,
         window_days: int = 30,
+        end: Optional[datetime] = None,
     ) -> Optional[GeneratedInsight]:
         """
         Example high-level insight: sleep quality & its relationship with HRV / activity.
 
         You can extend this pattern to stress, glycaemic control, mood, etc.
+        The window is resolved to one concrete end once (now, unless given) and
+        shared by every series and summary below.
         """
-        end = datetime.utcnow()
+        end = end or datetime.utcnow()
         start = end - timedelta(days=window_days)
 
         # 1) build series
@@ -317,6 +339,13 @@ class InsightEngine:
         if not sleep_series:
             return None
 
+        # Summaries use daily means; the activity series is summed per day, so its
+        # daily mean is the sum over the day's sample count (no second query).
+        activity_mean_series = [
+            DailyMetric(date=dm.date, value=dm.value / dm.count, count=dm.count)
+            for dm in activity_series
+        ]
+
         # 2) metric summaries
         metric_summaries: List[MetricSummary] = []
 
@@ -326,6 +355,7 @@ class InsightEngine:
             unit="hours",
             window_days=window_days,
             end=end,
+            series=sleep_series,
         )
         if sleep_summary:
             metric_summaries.append(sleep_summary)
@@ -336,6 +366,7 @@ class InsightEngine:
             unit="ms",
             window_days=window_days,
             end=end,
+            series=hrv_series,
         )
         if hrv_summary:
             metric_summaries.append(hrv_summary)
@@ -346,6 +377,7 @@ class InsightEngine:
             unit="minutes",
             window_days=window_days,
             end=end,
+            series=activity_mean_series,
         )
         if activity_summary:
             metric_summaries.append(activity_summary)
@@ -423,13 +455,22 @@ class InsightEngine:
 
     def persist_insight(self, insight: GeneratedInsight) -> None:
         """Store a GeneratedInsight into the database using InsightRepository."""
+        self.insight_repo.create(**self._insight_to_row(insight))
+
+    def persist_insights(self, insights: List[GeneratedInsight]) -> None:
+        """Store several GeneratedInsights with one InsightRepository.bulk_create call."""
+        if not insights:
+            return
+        self.insight_repo.bulk_create([self._insight_to_row(i) for i in insights])
+
+    @staticmethod
+    def _insight_to_row(insight: GeneratedInsight) -> Dict:
+        """InsightRepository.create() keyword arguments for a GeneratedInsight."""
         # You can decide how much to keep as structured vs text.
         # Here we store a compact version + metadata JSON.
 
-        from json import dumps
-
         metadata = {
-            "metric_summaries": [asdict(ms) for ms in insight.metric_summaries],
+            "metric_summaries": [_metric_summary_dict(ms) for ms in insight.metric_summaries],
             "correlations": [
                 {
                     "metric_x": c.metric_x,
@@ -445,7 +486,7 @@ class InsightEngine:
             "window_days": insight.window_days,
         }
 
-        self.insight_repo.create(
+        return dict(
             user_id=insight.user_id,
             insight_type=insight.category,
             title=insight.title,
@@ -466,7 +507,7 @@ def generated_insight_to_dict(insight: GeneratedInsight) -> Dict:
         "description": insight.description,
         "window_days": insight.window_days,
         "metric_summaries": [
-            asdict(ms) for ms in insight.metric_summaries
+            _metric_summary_dict(ms) for ms in insight.metric_summaries
         ],
         "correlations": [
             {
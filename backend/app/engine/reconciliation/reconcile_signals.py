@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 
+from sqlalchemy import and_, case, func, literal, or_, select
 from sqlalchemy.orm import Session
 
 from app.domain.models.health_data_point import HealthDataPoint
@@ -33,6 +34,7 @@ class SignalReconciliation:
         wearable_metric_key: Optional[str] = None,
         subjective_metric_key: Optional[str] = None,
         days: int = 14,
+        now: Optional[datetime] = None,
     ) -> Optional[Dict[str, Any]]:
         """
         Detect conflicts between wearable and subjective signals.
@@ -43,48 +45,30 @@ class SignalReconciliation:
         - subjective_metric_key: "sleep_quality" (user-reported)
         
         Returns conflict report if mismatch detected, None otherwise.
+        The window ends at `now` (default: current UTC time); pass one value to
+        reconcile several metrics over the same window.
         """
-        end_date = datetime.utcnow()
-        start_date = end_date - timedelta(days=days)
-        
-        # Get wearable data
-        wearable_points = []
-        if wearable_metric_key:
-            wearable_points = (
-                self.db.query(HealthDataPoint)
-                .filter(
-                    HealthDataPoint.user_id == user_id,
-                    HealthDataPoint.metric_type == wearable_metric_key,
-                    HealthDataPoint.source == "wearable",
-                    HealthDataPoint.timestamp >= start_date,
-                    HealthDataPoint.timestamp <= end_date,
-                )
-                .order_by(HealthDataPoint.timestamp.asc())
-                .all()
-            )
+        if not wearable_metric_key or not subjective_metric_key:
+            return None  # Can't detect conflict without both
         
-        # Get subjective data
-        subjective_points = []
-        if subjective_metric_key:
-            subjective_points = (
-                self.db.query(HealthDataPoint)
-                .filter(
-                    HealthDataPoint.user_id == user_id,
-                    HealthDataPoint.metric_type == subjective_metric_key,
-                    HealthDataPoint.source.in_(["manual", "questionnaire"]),
-                    HealthDataPoint.timestamp >= start_date,
-                    HealthDataPoint.timestamp <= end_date,
-                )
-                .order_by(HealthDataPoint.timestamp.asc())
-                .all()
-            )
+        end_date = now or datetime.utcnow()
+        start_date = end_date - timedelta(days=days)
         
-        if not wearable_points or not subjective_points:
+        # Split-half averages for both signals in one aggregate query; only one row
+        # per signal comes back instead of every data point in the window.
+        halves = self._split_half_averages(
+            user_id=user_id,
+            wearable_metric_key=wearable_metric_key,
+            subjective_metric_key=subjective_metric_key,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        if "wearable" not in halves or "subjective" not in halves:
             return None  # Can't detect conflict without both
         
         # Compute trends
-        wearable_trend = self._compute_trend(wearable_points)
-        subjective_trend = self._compute_trend(subjective_points)
+        wearable_trend = self._compute_trend(*halves["wearable"])
+        subjective_trend = self._compute_trend(*halves["subjective"])
         
         # Check for conflict
         if wearable_trend["direction"] != subjective_trend["direction"]:
@@ -107,18 +91,72 @@ class SignalReconciliation:
         
         return None
     
-    def _compute_trend(self, points: List[HealthDataPoint]) -> Dict[str, Any]:
-        """Compute trend direction and magnitude from data points."""
-        if len(points) < 2:
+    def _split_half_averages(
+        self,
+        *,
+        user_id: int,
+        wearable_metric_key: str,
+        subjective_metric_key: str,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> Dict[str, Tuple[int, Optional[float], Optional[float]]]:
+        """
+        (count, first-half average, second-half average) per signal ("wearable" /
+        "subjective"), splitting each signal's points in timestamp order at count // 2.
+        Signals without points in the window are absent from the result.
+        """
+        bucket = case(
+            (HealthDataPoint.source == "wearable", literal("wearable")),
+            else_=literal("subjective"),
+        )
+        ranked = (
+            select(
+                bucket.label("bucket"),
+                HealthDataPoint.value.label("value"),
+                func.row_number().over(partition_by=bucket, order_by=HealthDataPoint.timestamp.asc()).label("rn"),
+                func.count().over(partition_by=bucket).label("n"),
+            )
+            .where(
+                HealthDataPoint.user_id == user_id,
+                HealthDataPoint.timestamp >= start_date,
+                HealthDataPoint.timestamp <= end_date,
+                or_(
+                    and_(
+                        HealthDataPoint.metric_type == wearable_metric_key,
+                        HealthDataPoint.source == "wearable",
+                    ),
+                    and_(
+                        HealthDataPoint.metric_type == subjective_metric_key,
+                        HealthDataPoint.source.in_(["manual", "questionnaire"]),
+                    ),
+                ),
+            )
+            .subquery()
+        )
+        # rn * 2 <= n is rn <= n // 2 without relying on the dialect's integer division
+        in_first_half = ranked.c.rn * 2 <= ranked.c.n
+        rows = self.db.execute(
+            select(
+                ranked.c.bucket,
+                func.max(ranked.c.n),
+                func.avg(case((in_first_half, ranked.c.value))),
+                func.avg(case((~in_first_half, ranked.c.value))),
+            ).group_by(ranked.c.bucket)
+        ).all()
+        return {name: (n, first_avg, second_avg) for name, n, first_avg, second_avg in rows}
+    
+    def _compute_trend(
+        self,
+        count: int,
+        first_avg: Optional[float],
+        second_avg: Optional[float],
+    ) -> Dict[str, Any]:
+        """Compute trend direction and magnitude from split-half averages."""
+        if count < 2:
             return {"direction": "insufficient_data", "change_percent": 0.0}
         
-        # Split into first half and second half
-        mid = len(points) // 2
-        first_half = [p.value for p in points[:mid]]
-        second_half = [p.value for p in points[mid:]]
-        
-        first_avg = sum(first_half) / len(first_half) if first_half else 0
-        second_avg = sum(second_half) / len(second_half) if second_half else 0
+        first_avg = first_avg or 0
+        second_avg = second_avg or 0
         
         if first_avg == 0:
             change_percent = 0.0
@@ -142,6 +180,7 @@ class SignalReconciliation:
         user_id: int,
         metric_key: str,
         days: int = 14,
+        now: Optional[datetime] = None,
     ) -> Dict[str, Any]:
         """
         Generate reconciliation report for an insight.
@@ -170,6 +209,7 @@ class SignalReconciliation:
             wearable_metric_key=mapping.get("wearable"),
             subjective_metric_key=mapping.get("subjective"),
             days=days,
+            now=now,
         )
         
         if conflict:
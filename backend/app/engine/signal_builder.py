@@ -1,4 +1,6 @@
+from bisect import bisect_left
 from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Tuple
 from sqlalchemy.orm import Session
 from app.domain.models.health_data_point import HealthDataPoint
 
@@ -11,8 +13,9 @@ def fetch_recent_values(
     window_days: int,
 ) -> list[float]:
     since = datetime.utcnow() - timedelta(days=window_days)
+    # Only the value column is selected: plain row tuples, no ORM entity hydration
     rows = (
-        db.query(HealthDataPoint)
+        db.query(HealthDataPoint.value)
         .filter(
             HealthDataPoint.user_id == user_id,
             HealthDataPoint.metric_type == metric_key,
@@ -21,5 +24,86 @@ def fetch_recent_values(
         .order_by(HealthDataPoint.timestamp.asc())
         .all()
     )
-    return [r.value for r in rows if r.value is not None]
+    return [value for (value,) in rows if value is not None]
 
+
+def _recent_points_query(db: Session, keys: List[str], since: datetime, *columns):
+    """(*columns, metric_type, timestamp, value) rows for keys since `since`, oldest first."""
+    return (
+        db.query(*columns, HealthDataPoint.metric_type, HealthDataPoint.timestamp, HealthDataPoint.value)
+        .filter(
+            HealthDataPoint.metric_type.in_(keys),
+            HealthDataPoint.timestamp >= since,
+        )
+        .order_by(HealthDataPoint.timestamp.asc())
+    )
+
+
+def fetch_recent_values_bulk(
+    *,
+    db: Session,
+    user_id: int,
+    metric_keys: Iterable[str],
+    window_days: int = 14,
+) -> Dict[str, List[Tuple[datetime, float]]]:
+    """
+    Fetch recent (timestamp, value) pairs for several metrics in a single query.
+
+    Rows are grouped by metric_key in one pass and kept in ascending timestamp
+    order, so callers can slice shorter windows with values_since().
+    """
+    keys = list(metric_keys)
+    grouped: Dict[str, List[Tuple[datetime, float]]] = {k: [] for k in keys}
+    if not keys:
+        return grouped
+
+    since = datetime.utcnow() - timedelta(days=window_days)
+    rows = _recent_points_query(db, keys, since).filter(HealthDataPoint.user_id == user_id).all()
+    for metric_type, ts, value in rows:
+        if value is not None:
+            grouped[metric_type].append((ts, value))
+    return grouped
+
+
+def fetch_recent_values_bulk_for_users(
+    *,
+    db: Session,
+    user_ids: Iterable[int],
+    metric_keys: Iterable[str],
+    window_days: int = 14,
+) -> Dict[int, Dict[str, List[Tuple[datetime, float]]]]:
+    """
+    fetch_recent_values_bulk() for several users in a single query.
+
+    Returns {user_id: {metric_key: [(timestamp, value), ...]}} with an entry for
+    every requested user and metric, each list in ascending timestamp order.
+    """
+    keys = list(metric_keys)
+    ids = list(dict.fromkeys(user_ids))
+    by_user: Dict[int, Dict[str, List[Tuple[datetime, float]]]] = {
+        uid: {k: [] for k in keys} for uid in ids
+    }
+    if not keys or not ids:
+        return by_user
+
+    since = datetime.utcnow() - timedelta(days=window_days)
+    rows = (
+        _recent_points_query(db, keys, since, HealthDataPoint.user_id)
+        .filter(HealthDataPoint.user_id.in_(ids))
+        .all()
+    )
+    for uid, metric_type, ts, value in rows:
+        if value is not None:
+            by_user[uid][metric_type].append((ts, value))
+    return by_user
+
+
+def values_since(points: List[Tuple[datetime, float]], since: datetime) -> list[float]:
+    """
+    Slice (timestamp, value) pairs from fetch_recent_values_bulk down to a shorter window.
+
+    points are sorted by timestamp, so the window start is found by binary search
+    instead of comparing every timestamp. (since,) sorts before any (since, value).
+    """
+    start = bisect_left(points, (since,))
+    return [v for _, v in points[start:]]
@@ -1,5 +1,4 @@
 from datetime import date, timedelta
-from collections import defaultdict
 from typing import List, Dict, Any
 
 
@@ -12,32 +11,43 @@ class InsightSynthesizer:
         adherence_events: list,
         period: str = "daily",
     ) -> Dict[str, Any]:
-        # 1. Rank insights by importance
-        ranked = sorted(
-            insights,
-            key=lambda i: (
-                getattr(i, "insight_type", "") == "safety",
-                getattr(i, "confidence_score", 0),
-            ),
-            reverse=True,
-        )
-
-        # 2. Group by metric
-        by_metric = defaultdict(list)
-        for i in ranked:
+        # 1 + 2. Find each metric's strongest insight (safety first, then confidence)
+        # in one pass. Ties keep the earliest insight, as a stable sort would.
+        strongest: Dict[str, tuple] = {}
+        confidence_sum = 0
+        for index, i in enumerate(insights):
+            confidence = getattr(i, "confidence_score", 0)
+            confidence_sum += confidence
+            rank = (getattr(i, "insight_type", "") == "safety", confidence)
             metric_key = getattr(i, "metric_key", "unknown")
-            by_metric[metric_key].append(i)
+            best = strongest.get(metric_key)
+            if best is None or rank > best[0]:
+                strongest[metric_key] = (rank, index, i)
+
+        # Metrics ordered by their strongest insight's rank, earliest first on ties
+        by_metric = {
+            metric_key: i
+            for metric_key, (_, _, i) in sorted(
+                strongest.items(), key=lambda item: (item[1][0], -item[1][1]), reverse=True
+            )
+        }
 
-        # 3. Extract drivers
+        # 3. Extract drivers, interventions and outcomes in one pass
         drivers = []
+        interventions = set()
+        outcomes = []
         for e in evaluations:
             verdict = getattr(e, "verdict", None)
+            experiment_id = getattr(e, "experiment_id", None)
             if verdict == "helpful":
                 drivers.append({
-                    "intervention_id": getattr(e, "experiment_id", None),
+                    "intervention_id": experiment_id,
                     "metric": getattr(e, "metric_key", "unknown"),
                     "effect": getattr(e, "percent_change", 0),
                 })
+            if experiment_id:
+                interventions.add(experiment_id)
+            outcomes.append(getattr(e, "verdict", "unknown"))
 
         # 4. Build narrative
         headline = self._build_headline(by_metric, drivers)
@@ -48,9 +58,9 @@ class InsightSynthesizer:
             "narrative": narrative,
             "key_metrics": list(by_metric.keys())[:5],
             "drivers": drivers,
-            "interventions": list({getattr(e, "experiment_id", None) for e in evaluations if getattr(e, "experiment_id", None)}),
-            "outcomes": [getattr(e, "verdict", "unknown") for e in evaluations],
-            "confidence": self._estimate_confidence(insights),
+            "interventions": list(interventions),
+            "outcomes": outcomes,
+            "confidence": int(confidence_sum / len(insights) * 100) if insights else 0,
         }
 
     def _build_headline(self, by_metric, drivers):
@@ -63,16 +73,14 @@ class InsightSynthesizer:
 
     def _build_narrative(self, by_metric, drivers):
         lines = []
-        for metric, items in by_metric.items():
-            if items:
-                strongest = items[0]
-                insight_type = getattr(strongest, "insight_type", "change")
-                confidence = getattr(strongest, "confidence_score", 0)
-                metric_name = metric.replace("_", " ").title()
-                lines.append(
-                    f"{metric_name} showed a {insight_type} "
-                    f"with {int(confidence*100)}% confidence."
-                )
+        for metric, strongest in by_metric.items():
+            insight_type = getattr(strongest, "insight_type", "change")
+            confidence = getattr(strongest, "confidence_score", 0)
+            metric_name = metric.replace("_", " ").title()
+            lines.append(
+                f"{metric_name} showed a {insight_type} "
+                f"with {int(confidence*100)}% confidence."
+            )
 
         for d in drivers:
             lines.append(
@@ -81,10 +89,3 @@ class InsightSynthesizer:
             )
 
         return " ".join(lines) if lines else "No significant patterns detected."
-
-    def _estimate_confidence(self, insights):
-        if not insights:
-            return 0
-        confidences = [getattr(i, "confidence_score", 0) for i in insights]
-        return int(sum(confidences) / len(confidences) * 100) if confidences else 0
-
@@ -0,0 +1,69 @@
+"""Make notification_outbox.dedupe_key unique
+
+Revision ID: 20261017120000_unique_outbox_dedupe_key
+Revises: 20251216140000_standardize_metric_type
+Create Date: 2026-10-17 12:00:00
+
+Outbox enqueue dedupes with INSERT ... ON CONFLICT (dedupe_key) DO NOTHING,
+which needs a unique index on dedupe_key. NULL keys (no dedupe) never collide.
+
+Existing duplicates are not deleted. One row per key keeps its dedupe_key
+(a dispatched row first, then the oldest), and the others get a NULL key.
+"""
+
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+revision = "20261017120000_unique_outbox_dedupe_key"
+down_revision = "20251216140000_standardize_metric_type"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Clear dedupe_key on rows that duplicate another row's key, then recreate ix_outbox_dedupe as unique.
+    """
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'notification_outbox' not in inspector.get_table_names():
+        return
+
+    # Per dedupe_key, keep the key on a dispatched row if there is one, else on the oldest row.
+    # The other copies keep their delivery history but stop taking part in dedupe.
+    result = conn.execute(sa.text(
+        "UPDATE notification_outbox SET dedupe_key = NULL "
+        "WHERE dedupe_key IS NOT NULL AND id <> ("
+        "SELECT keep.id FROM notification_outbox keep "
+        "WHERE keep.dedupe_key = notification_outbox.dedupe_key "
+        "ORDER BY keep.is_dispatched DESC, keep.id ASC LIMIT 1"
+        ")"
+    ))
+    if result.rowcount:
+        logger.info("notification_outbox: cleared dedupe_key on %d duplicate rows", result.rowcount)
+
+    indexes = [idx['name'] for idx in inspector.get_indexes('notification_outbox')]
+    if 'ix_outbox_dedupe' in indexes:
+        op.drop_index('ix_outbox_dedupe', table_name='notification_outbox')
+    op.create_index('ix_outbox_dedupe', 'notification_outbox', ['dedupe_key'], unique=True)
+
+
+def downgrade():
+    """
+    Restore the non-unique dedupe_key index.
+    """
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'notification_outbox' not in inspector.get_table_names():
+        return
+
+    indexes = [idx['name'] for idx in inspector.get_indexes('notification_outbox')]
+    if 'ix_outbox_dedupe' in indexes:
+        op.drop_index('ix_outbox_dedupe', table_name='notification_outbox')
+    op.create_index('ix_outbox_dedupe', 'notification_outbox', ['dedupe_key'], unique=False)
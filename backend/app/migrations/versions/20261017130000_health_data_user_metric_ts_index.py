@@ -0,0 +1,65 @@
+"""Add covering (user_id, metric_type, timestamp) index on health_data
+
+Revision ID: 20261017130000_health_data_user_metric_ts_index
+Revises: 20261017120000_unique_outbox_dedupe_key
+Create Date: 2026-10-17 13:00:00
+
+Signal building and provider reconciliation read a user's recent points for a
+metric ordered by timestamp. Without an index these are full scans of health_data
+followed by a sort. On Postgres the index INCLUDEs value and source so the reads
+can be served index-only, and it is built CONCURRENTLY to avoid locking writes.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261017130000_health_data_user_metric_ts_index"
+down_revision = "20261017120000_unique_outbox_dedupe_key"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "ix_health_data_user_metric_ts"
+
+
+def upgrade():
+    """
+    Create ix_health_data_user_metric_ts if it does not exist yet.
+    """
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'health_data' not in inspector.get_table_names():
+        return
+
+    indexes = [idx['name'] for idx in inspector.get_indexes('health_data')]
+    if INDEX_NAME in indexes:
+        return
+
+    columns = ['user_id', 'metric_type', 'timestamp']
+    if conn.dialect.name == 'postgresql':
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+        with op.get_context().autocommit_block():
+            op.create_index(
+                INDEX_NAME,
+                'health_data',
+                columns,
+                postgresql_include=['value', 'source'],
+                postgresql_concurrently=True,
+            )
+    else:
+        op.create_index(INDEX_NAME, 'health_data', columns)
+
+
+def downgrade():
+    """
+    Drop ix_health_data_user_metric_ts.
+    """
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'health_data' not in inspector.get_table_names():
+        return
+
+    indexes = [idx['name'] for idx in inspector.get_indexes('health_data')]
+    if INDEX_NAME in indexes:
+        op.drop_index(INDEX_NAME, table_name='health_data')
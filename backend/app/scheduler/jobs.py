@@ -24,7 +24,7 @@ from app.domain.repositories.evaluation_repository import EvaluationRepository
 from app.domain.repositories.loop_decision_repository import LoopDecisionRepository
 from app.domain.repositories.daily_checkin_repository import DailyCheckInRepository
 
-from app.engine.loop_runner import run_loop  # your multi-metric loop runner
+from app.engine.loop_runner import run_loop, prefetch_recent_points  # your multi-metric loop runner
 from app.engine.baseline_service import recompute_baseline  # baseline compute per user+metric
 from app.domain.metric_registry import METRICS
 from app.domain.repositories.notification_outbox_repository import NotificationOutboxRepository
@@ -36,6 +36,9 @@ from datetime import date
 
 # We add Inbox/Notifications in STEP M, but jobs can import lazily to avoid hard dependency
 
+# Users whose recent health data is prefetched together for the daily loop
+LOOP_PREFETCH_BATCH_SIZE = 200
+
 def _now_utc() -> datetime:
     return datetime.utcnow()
 
@@ -69,15 +72,24 @@ def job_run_insights_for_all_users() -> dict:
         user_ids = _list_all_user_ids(db)
         processed = 0
         errors = 0
-        for uid in user_ids:
+        for start in range(0, len(user_ids), LOOP_PREFETCH_BATCH_SIZE):
+            batch = user_ids[start:start + LOOP_PREFETCH_BATCH_SIZE]
+            # One health-data query per batch of users; on failure each run_loop fetches its own
             try:
-                run_loop(db=db, user_id=uid)
-                processed += 1
+                recent_points_by_user = prefetch_recent_points(db, batch)
             except Exception as e:
-                errors += 1
-                # keep scheduler alive; log minimally
-                logger = logging.getLogger(__name__)
-                logger.error(f"[job_run_insights] user_id={uid} error={e}")
+                db.rollback()
+                logging.getLogger(__name__).warning(f"[job_run_insights] prefetch failed error={e}")
+                recent_points_by_user = {}
+            for uid in batch:
+                try:
+                    run_loop(db=db, user_id=uid, recent_points=recent_points_by_user.get(uid))
+                    processed += 1
+                except Exception as e:
+                    errors += 1
+                    # keep scheduler alive; log minimally
+                    logger = logging.getLogger(__name__)
+                    logger.error(f"[job_run_insights] user_id={uid} error={e}")
         return {"processed": processed, "errors": errors, "total_users": len(user_ids)}
     finally:
         db.close()
@@ -175,25 +187,26 @@ def job_generate_daily_inbox_items() -> dict:
     try:
         user_ids = _list_all_user_ids(db)
         checkin_repo = DailyCheckInRepository(db)
+        notif = NotificationService(db)
+        today = _today()
+        created = 0
+        errors = 0
 
-        for uid in user_ids:
+        # Batch per LOOP_PREFETCH_BATCH_SIZE users: one check-in lookup and one insert batch each.
+        # A failing batch is rolled back on its own; the other batches still get their reminders.
+        for start in range(0, len(user_ids), LOOP_PREFETCH_BATCH_SIZE):
+            batch = user_ids[start:start + LOOP_PREFETCH_BATCH_SIZE]
             try:
-                today = _today()
-                existing = checkin_repo.get_by_date(user_id=uid, checkin_date=today)
-                if existing is None:
-                    # Use NotificationService for idempotent notification creation
-                    try:
-                        from app.engine.notifications.notification_service import NotificationService
-                        notif = NotificationService(db)
-                        notif.daily_checkin_reminder(user_id=uid, checkin_date=today)
-                        db.commit()
-                    except Exception as e:
-                        # Inbox not installed yet or other error
-                        logger.error(f"[job_daily_inbox] user_id={uid} inbox_error={e}")
+                checked_in = checkin_repo.user_ids_with_checkin(batch, today)
+                created += notif.daily_checkin_reminders([uid for uid in batch if uid not in checked_in], today)
+                db.commit()
             except Exception as e:
-                logger.error(f"[job_daily_inbox] user_id={uid} error={e}")
-        
-        return {"processed": len(user_ids), "errors": 0}  # Simplified for now
+                db.rollback()
+                errors += 1
+                logger.error(f"[job_daily_inbox] batch_start={start} batch_size={len(batch)} inbox_error={e}")
+        logger.info(f"[job_daily_inbox] reminders_created={created}")
+
+        return {"processed": len(user_ids), "created": created, "errors": errors}
     finally:
         db.close()
 
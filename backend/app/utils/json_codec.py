@@ -0,0 +1,72 @@
+"""
+Fast JSON encode/decode for hot paths (insight metadata).
+
+Uses orjson when installed and falls back to the stdlib json module, so callers
+always get str out of dumps() and plain Python objects out of loads(). The
+fallback writes the same JSON as orjson for the types the app stores: compact
+separators, numpy scalars/arrays, datetimes as ISO 8601, NaN/Infinity as null.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from datetime import date, datetime, time
+from typing import Any, Union
+
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    # Non-str dict keys are coerced like json.dumps does, and numpy scalars coming out of
+    # the detectors are serialized instead of raising.
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None  # type: ignore
+
+
+_SEPARATORS = (",", ":")
+
+
+def _default(obj: Any) -> Any:
+    """json.dumps default= hook for the non-JSON types orjson serializes natively."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _non_finite_to_none(obj: Any) -> Any:
+    """Copy of obj with NaN/Infinity floats replaced by None, as orjson writes them."""
+    if isinstance(obj, (float, np.floating)):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _non_finite_to_none(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_non_finite_to_none(v) for v in obj]
+    if isinstance(obj, np.ndarray):
+        return _non_finite_to_none(obj.tolist())
+    return obj
+
+
+def dumps(obj: Any) -> str:
+    """Serialize obj to a compact JSON string (NaN/Infinity become null)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode("utf-8")
+    try:
+        return json.dumps(obj, default=_default, allow_nan=False, separators=_SEPARATORS)
+    except ValueError:
+        # Non-finite floats are rare: only then walk the object to null them out
+        return json.dumps(_non_finite_to_none(obj), default=_default, allow_nan=False, separators=_SEPARATORS)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON string (or bytes)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,89 @@
+"""Tests for data quality gates"""
+from datetime import datetime
+
+import pytest
+
+from app.domain.metric_registry import get_metric_spec
+from app.engine.quality.data_quality_service import DataQualityService
+from app.providers.base import NormalizedPoint
+
+
+def _point(timestamp: datetime) -> NormalizedPoint:
+    return NormalizedPoint("resting_hr", 60.0, "bpm", timestamp, "whoop", {})
+
+
+class TestShouldRejectPoint:
+    """Test DataQualityService.should_reject_point duplicate handling"""
+
+    def test_duplicate_within_same_minute(self):
+        """Test that a point in an already-seen minute is rejected"""
+        service = DataQualityService()
+        seen = {service.duplicate_key(datetime(2024, 1, 1, 8, 0, 5))}
+        rejected, reason = service.should_reject_point(
+            point=_point(datetime(2024, 1, 1, 8, 0, 45)),
+            metric_spec=get_metric_spec("resting_hr"),
+            existing_timestamps=seen,
+        )
+        assert rejected is True
+        assert reason == "Duplicate timestamp"
+
+    def test_next_minute_accepted(self):
+        """Test that a point in a new minute passes"""
+        service = DataQualityService()
+        seen = {service.duplicate_key(datetime(2024, 1, 1, 8, 0, 5))}
+        rejected, reason = service.should_reject_point(
+            point=_point(datetime(2024, 1, 1, 8, 1, 0)),
+            metric_spec=get_metric_spec("resting_hr"),
+            existing_timestamps=seen,
+        )
+        assert rejected is False
+        assert reason is None
+
+
+class TestQualityScores:
+    """Test the batch quality dimensions"""
+
+    def test_scores_on_mixed_batch(self):
+        """Test each dimension on a batch with a duplicate, a spike and an old point"""
+        service = DataQualityService()
+        base = datetime(2024, 1, 10, 8, 0)
+        points = [
+            NormalizedPoint("resting_hr", 60.0, "bpm", base, "whoop", {}),
+            NormalizedPoint("resting_hr", 60.0, "bpm", base, "whoop", {}),  # duplicate
+            NormalizedPoint("resting_hr", 120.0, "bpm", base.replace(hour=9), "whoop", {}),  # +100% spike
+            NormalizedPoint("resting_hr", 500.0, "bpm", base.replace(day=1), "whoop", {}),  # out of range, 9 days old
+        ]
+        metric_specs = {"resting_hr": get_metric_spec("resting_hr")}
+
+        assert service.score_completeness(points) == 1.0
+        assert service.score_consistency(points, metric_specs) == 0.75
+        assert service.score_timeliness(points, ingestion_time=base) == 0.75
+        # Sorted: 500 -> 60 -> 60 -> 120; changes 0.88, 0.0, 1.0
+        assert service.score_stability(points) == pytest.approx(1 / 3)
+        assert service.score_duplication(points) == 0.75
+
+    def test_empty_batch(self):
+        """Test the empty-batch defaults"""
+        score = DataQualityService().compute_quality_score(points=[], metric_specs={}, ingestion_time=datetime(2024, 1, 1))
+        assert (score.completeness, score.consistency, score.timeliness) == (0.0, 0.0, 0.0)
+        assert (score.stability, score.duplication) == (1.0, 1.0)
+
+    def test_consistency_without_matching_specs(self):
+        """Test that points with no metric spec are never consistent"""
+        service = DataQualityService()
+        points = [NormalizedPoint("unknown_metric", 1.0, "x", datetime(2024, 1, 1), "whoop", {})]
+        assert service.score_consistency(points, {}) == 0.0
+        assert service.score_consistency(points, {"resting_hr": get_metric_spec("resting_hr")}) == 0.0
+
+    def test_stability_same_for_sorted_and_shuffled_batches(self):
+        """Test that stability does not depend on arrival order"""
+        service = DataQualityService()
+        base = datetime(2024, 1, 10)
+        values = [60.0, 61.0, 120.0, 62.0, 0.0, 63.0]
+        points = [
+            NormalizedPoint("resting_hr", v, "bpm", base.replace(hour=i), "whoop", {})
+            for i, v in enumerate(values)
+        ]
+        # Changes: 0.02, 0.97, 0.48, 1.0 (zero predecessor skipped)
+        assert service.score_stability(points) == 0.5
+        assert service.score_stability(points[::-1][:3] + points[:3]) == 0.5
@@ -0,0 +1,60 @@
+"""Tests for trend and instability detector math"""
+import statistics
+
+import pytest
+
+from app.engine.detectors.instability_detector import _population_std, detect_instability
+from app.engine.detectors.trend_detector import _linear_regression_slope, detect_trend
+
+
+class TestLinearRegressionSlope:
+    """Test _linear_regression_slope function"""
+
+    def test_exact_line(self):
+        """Test slope of a perfect line"""
+        assert _linear_regression_slope([3.0 + 2.0 * i for i in range(10)]) == pytest.approx(2.0)
+
+    def test_single_point(self):
+        """Test that a single point has zero slope"""
+        assert _linear_regression_slope([5.0]) == 0.0
+
+    def test_detect_trend_uses_slope(self):
+        """Test trend detection on a rising series"""
+        result = detect_trend(metric_key="steps", values=[100.0 * i for i in range(14)], window_days=14, slope_threshold=50)
+        assert result is not None
+        assert result.direction == "up"
+        assert result.slope_per_day == pytest.approx(100.0)
+
+    def test_detect_trend_flat_window(self):
+        """Test that a constant window never reports a trend"""
+        assert detect_trend(metric_key="steps", values=[5.0] * 14, window_days=14, slope_threshold=0.1) is None
+
+
+class TestPopulationStd:
+    """Test _population_std function"""
+
+    @pytest.mark.parametrize("values", [
+        [1.0, 2.0, 3.0, 4.0],
+        [60.0, 85.0, 35.0, 85.0, 35.0, 85.0, 35.0],
+        [450.2, 438.9, 426.1, 414.7, 402.3],
+    ])
+    def test_matches_statistics_pstdev(self, values):
+        """Test parity with statistics.pstdev"""
+        assert _population_std(values) == pytest.approx(statistics.pstdev(values), rel=1e-12)
+
+    def test_detect_instability_ratio(self):
+        """Test instability ratio against the baseline std"""
+        values = [60.0 + (25.0 if i % 2 else -25.0) for i in range(14)]
+        result = detect_instability(
+            metric_key="hrv_rmssd", values=values, baseline_std=10.0, window_days=14, ratio_threshold=1.5
+        )
+        assert result is not None
+        assert result.ratio == pytest.approx(2.5)
+        assert result.strength == "strong"
+
+    def test_detect_instability_flat_window(self):
+        """Test that a constant window never reports instability"""
+        result = detect_instability(
+            metric_key="hrv_rmssd", values=[60.0] * 14, baseline_std=10.0, window_days=14, ratio_threshold=1.5
+        )
+        assert result is None
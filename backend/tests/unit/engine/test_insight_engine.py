@@ -121,6 +121,49 @@ def test_sleep_insight_generation_with_mock_data():
     assert "metric_summaries" in fake_repo.saved["metadata_json"]
 
 
+def test_sleep_insight_reuses_fetched_series():
+    """Summaries reuse the series built for correlations: one repo query per metric."""
+
+    class CountingWearableRepo(FakeWearableRepo):
+        def __init__(self):
+            self.calls = []
+            self.windows = set()
+
+        def list_for_user_in_range(self, user_id, start, end, metric_type=None):
+            self.calls.append(metric_type)
+            self.windows.add((start, end))
+            points = super().list_for_user_in_range(user_id, start, end, metric_type)
+            # Two samples per day so daily sum and daily mean differ
+            return points + points
+
+    repo = CountingWearableRepo()
+    engine = InsightEngine(
+        lab_repo=FakeLabRepo(),
+        wearable_repo=repo,
+        health_data_repo=FakeHealthRepo(),
+        symptom_repo=FakeSymptomRepo(),
+        insight_repo=FakeInsightRepo(),
+    )
+
+    end = datetime.utcnow()
+    insight = engine.generate_sleep_insights(user_id=1, window_days=14, end=end)
+
+    assert sorted(repo.calls) == ["activity_minutes", "hrv", "sleep_duration"]
+    assert repo.windows == {(end - timedelta(days=14), end)}
+
+    # Summaries match what a standalone (querying) summary computes
+    for summary in insight.metric_summaries:
+        standalone = engine.summarise_wearable_metric(
+            user_id=1,
+            metric_name=summary.metric_name,
+            unit=summary.unit,
+            window_days=14,
+        )
+        assert summary.latest_value == standalone.latest_value
+        assert summary.mean_value == standalone.mean_value
+        assert summary.trend == standalone.trend
+
+
 def test_metric_summary_structure():
     """Ensure MetricSummary structure is valid."""
     fake_repo = FakeInsightRepo()
@@ -389,6 +432,38 @@ def test_persist_insight_structure():
     assert metadata["window_days"] == 14
 
 
+def test_persist_insights_single_bulk_call():
+    """persist_insights hands every row to one bulk_create call, shaped like persist_insight's."""
+
+    class BulkInsightRepo(FakeInsightRepo):
+        def __init__(self):
+            super().__init__()
+            self.bulk_calls = []
+
+        def bulk_create(self, rows):
+            self.bulk_calls.append(rows)
+            return rows
+
+    fake_repo = BulkInsightRepo()
+    engine = InsightEngine(
+        lab_repo=FakeLabRepo(),
+        wearable_repo=FakeWearableRepo(),
+        health_data_repo=FakeHealthRepo(),
+        symptom_repo=FakeSymptomRepo(),
+        insight_repo=fake_repo,
+    )
+
+    insight = engine.generate_sleep_insights(user_id=1, window_days=14)
+    engine.persist_insights([insight, insight])
+    engine.persist_insight(insight)
+
+    assert len(fake_repo.bulk_calls) == 1
+    assert fake_repo.bulk_calls[0] == [fake_repo.saved, fake_repo.saved]
+
+    engine.persist_insights([])
+    assert len(fake_repo.bulk_calls) == 1
+
+
 def test_correlate_daily_metrics():
     """Test correlation computation between metrics"""
     from app.engine.analytics.time_series import DailyMetric
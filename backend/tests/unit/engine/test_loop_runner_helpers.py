@@ -0,0 +1,79 @@
+"""Tests for loop runner helpers"""
+from types import SimpleNamespace
+
+import pytest
+
+from app.engine.loop_runner import (
+    SYMPTOM_KEYWORDS,
+    _domain_statuses_changed,
+    _insight_metadata,
+    _match_symptom_keywords,
+)
+
+
+class TestMatchSymptomKeywords:
+    """Test _match_symptom_keywords function"""
+
+    def test_no_keywords(self):
+        """Test text without any symptom keywords"""
+        assert _match_symptom_keywords("slept well, felt great") == set()
+
+    def test_overlapping_keywords_all_found(self):
+        """Test that keywords contained in longer keywords are also reported"""
+        found = _match_symptom_keywords("bad headache and joint pain today")
+        assert found == {"headache", "ache", "joint pain", "pain"}
+
+    @pytest.mark.parametrize("text", [
+        "tired tired tired",
+        "brain fog, nausea, dizziness",
+        "shortness of breathchest pain",
+        "",
+    ])
+    def test_matches_substring_scan(self, text):
+        """Test parity with a naive per-keyword substring scan"""
+        expected = {k for k in SYMPTOM_KEYWORDS if k in text}
+        assert _match_symptom_keywords(text) == expected
+
+
+class TestInsightMetadata:
+    """Test _insight_metadata function"""
+
+    def test_parses_once_and_memoizes(self):
+        """Test that the parsed dict is cached on the insight and reused"""
+        ins = SimpleNamespace(metadata_json='{"metric_key": "sleep_duration"}')
+        first = _insight_metadata(ins)
+        assert first == {"metric_key": "sleep_duration"}
+        ins.metadata_json = "not json"
+        assert _insight_metadata(ins) is first
+
+    @pytest.mark.parametrize("raw", ["", None, "not json", "[1, 2]"])
+    def test_invalid_metadata_is_empty_dict(self, raw):
+        """Test that missing or non-object metadata yields an empty dict"""
+        assert _insight_metadata(SimpleNamespace(metadata_json=raw)) == {}
+
+
+class TestDomainStatusesChanged:
+    """Test _domain_statuses_changed function"""
+
+    @staticmethod
+    def _repo(*entries):
+        """Audit repository stub whose latest domain_status entries are `entries` (newest first)"""
+        def list_for_entity(user_id, entity_type, entity_id, limit):
+            assert (entity_type, entity_id, limit) == ("domain_status", user_id, 1)
+            return [SimpleNamespace(metadata_json=raw) for raw in entries[:limit]]
+        return SimpleNamespace(list_for_entity=list_for_entity)
+
+    def test_unchanged_statuses_skip_the_audit_row(self):
+        """Test that statuses equal to the latest entry report no change"""
+        repo = self._repo('{"computed_at": "2026-01-01T00:00:00", "domain_statuses": {"sleep": "STABLE"}}')
+        assert _domain_statuses_changed(repo, 1, {"sleep": "STABLE"}) is False
+
+    def test_changed_statuses_are_recorded(self):
+        """Test that a status differing from the latest entry reports a change"""
+        repo = self._repo('{"domain_statuses": {"sleep": "STABLE"}}')
+        assert _domain_statuses_changed(repo, 1, {"sleep": "BASELINE_BUILDING"}) is True
+
+    @pytest.mark.parametrize("entries", [(), (None,), ("not json",)])
+    def test_missing_or_unreadable_history_is_recorded(self, entries):
+        """Test that no usable previous entry always reports a change"""
+        assert _domain_statuses_changed(self._repo(*entries), 1, {"sleep": "STABLE"}) is True
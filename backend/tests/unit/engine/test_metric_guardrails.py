@@ -0,0 +1,26 @@
+"""Tests for metric guardrail thresholds"""
+from app.engine.guardrails import apply_guardrails
+
+
+class TestApplyGuardrails:
+    """Test apply_guardrails function"""
+
+    def test_all_values_below_critical_low(self):
+        """Test that a window entirely below critical_low triggers"""
+        result = apply_guardrails(metric_key="sleep_duration", values=[200.0, 230.0, 240.0])
+        assert result is not None
+        assert result["status"] == "detected"
+
+    def test_one_value_above_critical_low(self):
+        """Test that a single value above critical_low suppresses the warning"""
+        assert apply_guardrails(metric_key="sleep_duration", values=[200.0, 300.0, 230.0]) is None
+
+    def test_all_values_above_critical_high(self):
+        """Test that a window entirely above critical_high triggers"""
+        assert apply_guardrails(metric_key="resting_hr", values=[100.0, 120.0]) is not None
+        assert apply_guardrails(metric_key="resting_hr", values=[99.0, 120.0]) is None
+
+    def test_unknown_metric(self):
+        """Test that metrics without red flags are ignored"""
+        assert apply_guardrails(metric_key="steps", values=[0.0]) is None
+
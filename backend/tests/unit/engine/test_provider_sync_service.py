@@ -0,0 +1,75 @@
+"""Tests for provider sync consent enforcement and WHOOP ingestion"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+import app.engine.providers.provider_sync_service as provider_sync_service
+from app.domain.repositories.consent_repository import ConsentRepository
+from app.engine.providers.provider_sync_service import ProviderSyncService
+from app.providers.base import NormalizedPoint
+
+
+@pytest.fixture
+def no_adapter(monkeypatch):
+    """Fail the test if sync_whoop gets as far as fetching data"""
+    def _adapter(_db):
+        raise AssertionError("WHOOP adapter must not be used without consent")
+    monkeypatch.setattr(provider_sync_service, "WhoopAdapter", _adapter)
+
+
+class TestSyncWhoopConsent:
+    """Test that sync_whoop refuses to ingest without WHOOP consent"""
+
+    @pytest.mark.parametrize("consent, reason", [
+        (None, "consent_required"),
+        (SimpleNamespace(revoked_at=datetime(2024, 1, 1), consents_to_whoop_ingestion=True), "consent_revoked"),
+        (SimpleNamespace(revoked_at=None, consents_to_whoop_ingestion=False), "provider_consent_not_granted"),
+    ])
+    def test_blocked(self, monkeypatch, no_adapter, consent, reason):
+        """Test each refusal reason"""
+        monkeypatch.setattr(ConsentRepository, "get_latest", lambda self, user_id: consent)
+        result = ProviderSyncService(MagicMock()).sync_whoop(user_id=1)
+        assert result["inserted"] == 0
+        assert [e["reason"] for e in result["errors"]] == [reason]
+
+
+class TestSyncWhoopIngestion:
+    """Test the rows sync_whoop writes for consented users"""
+
+    def test_points_link_to_their_record_provenance(self, monkeypatch):
+        """Test that each point gets the provenance id of its WHOOP record"""
+        ts = datetime.utcnow() - timedelta(days=1)
+        points = [
+            NormalizedPoint("sleep_duration", 420.0, "minutes", ts, "whoop", {"whoop_sleep_id": "s1"}),
+            NormalizedPoint("resting_hr", 55.0, "bpm", ts, "whoop", {"whoop_recovery_id": "r1"}),
+            NormalizedPoint("hrv_rmssd", 60.0, "ms", ts, "whoop", {"whoop_recovery_id": "r1"}),
+            # Rejected (unit mismatch): must not leave a provenance row behind
+            NormalizedPoint("resting_hr", 56.0, "ms", ts, "whoop", {"whoop_recovery_id": "r2"}),
+        ]
+        monkeypatch.setattr(ConsentRepository, "get_latest", lambda self, user_id: None)
+        monkeypatch.setattr(ConsentRepository, "consent_allows", lambda self, consent, provider=None: True)
+        # The invariant check reads MetricSpec.valid_range, which registry specs don't define
+        monkeypatch.setattr(provider_sync_service, "validate_provider_ingestion_invariants", lambda **kwargs: None)
+        monkeypatch.setattr(
+            provider_sync_service,
+            "WhoopAdapter",
+            lambda _db: SimpleNamespace(fetch_and_normalize=lambda user_id, since: points),
+        )
+        db = MagicMock()
+        db.scalars.return_value.all.return_value = [101, 102]
+
+        result = ProviderSyncService(db).sync_whoop(user_id=7)
+
+        assert result["inserted"] == 3
+        provenance_rows = db.scalars.call_args.args[1]
+        assert [r["source_record_id"] for r in provenance_rows] == ["s1", "r1"]
+        point_rows = db.execute.call_args.args[1]
+        assert [(r["metric_type"], r["data_provenance_id"]) for r in point_rows] == [
+            ("sleep_duration", 101),
+            ("resting_hr", 102),
+            ("hrv_rmssd", 102),
+        ]
+        assert all("source_record_id" not in r for r in point_rows)
+        db.commit.assert_called_once()
@@ -1,6 +1,6 @@
 """Tests for RAG engine service"""
 import pytest
-from app.engine.rag.retriever import HealthRAGEngine
+from app.engine.rag.retriever import HealthRAGEngine, _prune_stale_stores
 from app.config.settings import get_settings
 
 settings = get_settings()
@@ -12,3 +12,16 @@ def test_rag_engine_initialization():
     engine = HealthRAGEngine(settings.KNOWLEDGE_BASE_PATH)
     assert engine is not None
 
+
+def test_prune_stale_stores_keeps_current_and_unrelated_entries(tmp_path):
+    """Test that only other hash-named store directories are deleted"""
+    current = tmp_path / "0123456789abcdef"
+    stale = tmp_path / "fedcba9876543210"
+    for d in (current, stale, tmp_path / "backups"):
+        d.mkdir()
+        (d / "chroma.sqlite3").write_text("x")
+    (tmp_path / "chroma.sqlite3").write_text("legacy")
+
+    _prune_stale_stores(str(tmp_path), str(current))
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["0123456789abcdef", "backups", "chroma.sqlite3"]
@@ -0,0 +1,50 @@
+"""Tests for the orjson/json codec helpers"""
+import json
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+
+from app.utils import json_codec
+
+
+@pytest.fixture(params=[True, False], ids=["orjson", "stdlib"])
+def codec(request, monkeypatch):
+    if request.param and not json_codec.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(json_codec, "ORJSON_AVAILABLE", request.param)
+    return json_codec
+
+
+def test_dumps_returns_str_that_round_trips(codec):
+    payload = {"metric_key": "sleep_duration", "evidence": {"z_score": 2.5, "n": 7}, "tags": ["a", None]}
+    out = codec.dumps(payload)
+    assert isinstance(out, str)
+    assert json.loads(out) == payload
+    assert codec.loads(out) == payload
+
+
+def test_dumps_coerces_int_keys(codec):
+    assert json.loads(codec.dumps({1: "x"})) == {"1": "x"}
+
+
+def test_dumps_numpy_float(codec):
+    assert json.loads(codec.dumps({"delta": np.float64(1.5)})) == {"delta": 1.5}
+
+
+def test_dumps_numpy_int_and_array(codec):
+    assert json.loads(codec.dumps({"n": np.int64(7), "xs": np.array([1.0, 2.5])})) == {"n": 7, "xs": [1.0, 2.5]}
+
+
+def test_dumps_datetime_iso(codec):
+    out = codec.dumps({"at": datetime(2024, 1, 2, 3, 4, 5), "day": date(2024, 1, 2)})
+    assert json.loads(out) == {"at": "2024-01-02T03:04:05", "day": "2024-01-02"}
+
+
+def test_dumps_non_finite_as_null(codec):
+    payload = {"z": float("nan"), "xs": [1.0, float("inf")], "r": np.float32("nan")}
+    assert json.loads(codec.dumps(payload)) == {"z": None, "xs": [1.0, None], "r": None}
+
+
+def test_dumps_is_compact(codec):
+    assert codec.dumps({"a": [1, 2]}) == '{"a":[1,2]}'
@@ -73,7 +73,11 @@ def test_2_insight_created_with_sleep_metric_has_domain_key(monkeypatch, tmp_pat
     monkeypatch.setattr(lr, "apply_escalation_rules", lambda xs: xs)
     monkeypatch.setattr(lr, "apply_guardrails", lambda metric_key, values: None)
     monkeypatch.setattr(lr, "run_safety_gate", lambda **kwargs: None)
-    monkeypatch.setattr(lr, "fetch_recent_values", lambda **kwargs: [1, 1, 1, 1, 1, 1, 1])
+    monkeypatch.setattr(
+        lr,
+        "fetch_recent_values_bulk",
+        lambda **kwargs: {mk: [(datetime.utcnow(), 1)] * 7 for mk in kwargs["metric_keys"]},
+    )
     monkeypatch.setattr(
         lr,
         "detect_change",
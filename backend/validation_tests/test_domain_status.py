@@ -138,3 +138,40 @@ def test_4_sleep_baseline_with_surfaced_insight__signal_detected(tmp_path):
         db.close()
 
 
+
+
+def test_5_compute_domain_statuses_matches_per_domain(tmp_path):
+    from app.engine.domain_status import compute_domain_status, compute_domain_statuses, DomainStatus
+    from app.domain.health_domains import HEALTH_DOMAINS, HealthDomainKey
+    from app.domain.models.health_data_point import HealthDataPoint
+    from app.domain.models.baseline import Baseline
+    from types import SimpleNamespace
+    import json
+
+    TestingSessionLocal = _make_db(tmp_path)
+    db = TestingSessionLocal()
+    try:
+        for mk in ("sleep_duration", "resting_hr", "hrv_rmssd"):
+            db.add(
+                HealthDataPoint(
+                    user_id=1,
+                    metric_type=mk,
+                    value=50.0,
+                    unit="x",
+                    source="manual",
+                    timestamp=datetime.utcnow(),
+                )
+            )
+        db.add(Baseline(user_id=1, metric_type="sleep_duration", mean=400.0, std=30.0, window_days=30))
+        db.add(Baseline(user_id=1, metric_type="resting_hr", mean=60.0, std=3.0, window_days=30))
+        db.commit()
+
+        surfaced = [SimpleNamespace(metadata_json=json.dumps({"metric_key": "sleep_duration"}))]
+        statuses = compute_domain_statuses(db, user_id=1, surfaced_insights=surfaced)
+        assert list(statuses.keys()) == list(HEALTH_DOMAINS.keys())
+        for dk in HEALTH_DOMAINS.keys():
+            assert statuses[dk] == compute_domain_status(db, user_id=1, domain_key=dk, surfaced_insights=surfaced)
+        assert statuses[HealthDomainKey.SLEEP] == DomainStatus.SIGNAL_DETECTED
+        assert DomainStatus.NO_DATA in statuses.values()
+    finally:
+        db.close()
@@ -280,7 +280,11 @@ def test_6_claim_policy_enforced_on_generated_insight(app_and_db, monkeypatch):
         monkeypatch.setattr(lr, "filter_insights", lambda xs: xs)
         monkeypatch.setattr(lr, "apply_escalation_rules", lambda xs: xs)
         monkeypatch.setattr(lr, "apply_guardrails", lambda metric_key, values: None)
-        monkeypatch.setattr(lr, "fetch_recent_values", lambda **kwargs: [1, 1, 1, 1, 1, 1, 1])
+        monkeypatch.setattr(
+            lr,
+            "fetch_recent_values_bulk",
+            lambda **kwargs: {mk: [(datetime.utcnow(), 1)] * 7 for mk in kwargs["metric_keys"]},
+        )
         monkeypatch.setattr(lr, "run_safety_gate", lambda **kwargs: None)
 
         DummyPolicy = SimpleNamespace(
@@ -470,7 +474,11 @@ def test_10_suppression_daily_cap_enforced_low_conf_suppressed_first(app_and_db,
         monkeypatch.setattr(lr, "filter_insights", lambda xs: xs)
         monkeypatch.setattr(lr, "apply_escalation_rules", lambda xs: xs)
         monkeypatch.setattr(lr, "apply_guardrails", lambda metric_key, values: None)
-        monkeypatch.setattr(lr, "fetch_recent_values", lambda **kwargs: [1, 1, 1, 1, 1, 1, 1])
+        monkeypatch.setattr(
+            lr,
+            "fetch_recent_values_bulk",
+            lambda **kwargs: {mk: [(datetime.utcnow(), 1)] * 7 for mk in kwargs["metric_keys"]},
+        )
         monkeypatch.setattr(lr, "run_safety_gate", lambda **kwargs: None)
         DummyPolicy = SimpleNamespace(
             allowed_insights=["change"],
@@ -509,6 +517,12 @@ def test_10_suppression_daily_cap_enforced_low_conf_suppressed_first(app_and_db,
         surfaced = [float(x.confidence_score or 0.0) for x in res["items"]]
         assert all(c >= 0.5 for c in surfaced)
         assert surfaced.count(0.9) == 5
+
+        # Every suppressed insight is recorded as a suppression DecisionSignal.
+        from app.domain.models.decision_signal import DecisionSignal  # noqa: WPS433
+        signals = db.query(DecisionSignal).filter(DecisionSignal.user_id == 1).all()
+        assert len(signals) == res["suppressed"]
+        assert all(s.is_suppressed and s.source_type == "insight" for s in signals)
     finally:
         db.close()
 
@@ -539,7 +553,11 @@ def test_11_duplicate_within_7_days_suppressed_unless_high_conf(app_and_db, monk
         monkeypatch.setattr(lr, "filter_insights", lambda xs: xs)
         monkeypatch.setattr(lr, "apply_escalation_rules", lambda xs: xs)
         monkeypatch.setattr(lr, "apply_guardrails", lambda metric_key, values: None)
-        monkeypatch.setattr(lr, "fetch_recent_values", lambda **kwargs: [1, 1, 1, 1, 1, 1, 1])
+        monkeypatch.setattr(
+            lr,
+            "fetch_recent_values_bulk",
+            lambda **kwargs: {mk: [(datetime.utcnow(), 1)] * 7 for mk in kwargs["metric_keys"]},
+        )
         monkeypatch.setattr(lr, "run_safety_gate", lambda **kwargs: None)
         DummyPolicy = SimpleNamespace(
             allowed_insights=["change"],
@@ -595,3 +613,209 @@ def test_12_migration_integrity_fresh_db(tmp_path):
     cols = [c["name"] for c in insp.get_columns("health_data")]
     assert "metric_type" in cols
 
+
+
+def test_13_daily_cap_already_reached_skips_detection(app_and_db, monkeypatch):
+    _, TestingSessionLocal, _ = app_and_db
+    db = TestingSessionLocal()
+    try:
+        from app.domain.models.insight import Insight  # noqa: WPS433
+        from app.domain.models.baseline import Baseline  # noqa: WPS433
+
+        db.add(Baseline(user_id=1, metric_type="sleep_duration", mean=100.0, std=10.0, window_days=30))
+        for i in range(10):
+            db.add(
+                Insight(
+                    user_id=1,
+                    insight_type="change",
+                    title=f"Earlier {i}",
+                    description="Earlier",
+                    confidence_score=0.9,
+                    generated_at=datetime.utcnow(),
+                    metadata_json=json.dumps({"metric_key": "sleep_duration"}),
+                )
+            )
+        db.commit()
+
+        import app.engine.loop_runner as lr  # noqa: WPS433
+        monkeypatch.setattr(lr, "METRICS", {"sleep_duration": object()})
+        monkeypatch.setattr(lr, "apply_guardrails", lambda metric_key, values: None)
+        monkeypatch.setattr(
+            lr,
+            "fetch_recent_values_bulk",
+            lambda **kwargs: {mk: [(datetime.utcnow(), 1)] * 7 for mk in kwargs["metric_keys"]},
+        )
+        monkeypatch.setattr(lr, "run_safety_gate", lambda **kwargs: None)
+
+        def _must_not_run(**kwargs):
+            raise AssertionError("detector ran after daily cap was reached")
+
+        monkeypatch.setattr(lr, "detect_change", _must_not_run)
+
+        res = lr.run_loop(db=db, user_id=1)
+        assert res["created"] == 0
+        assert res["skipped"] == "daily_cap"
+        assert db.query(Insight).filter(Insight.user_id == 1).count() == 10
+    finally:
+        db.close()
+
+
+def test_14_weak_signal_status_persisted(app_and_db, monkeypatch):
+    _, TestingSessionLocal, _ = app_and_db
+    db = TestingSessionLocal()
+    try:
+        from app.domain.models.insight import Insight  # noqa: WPS433
+        from app.domain.models.baseline import Baseline  # noqa: WPS433
+
+        metric_keys = ["sleep_duration", "resting_hr"]
+        for mk in metric_keys:
+            db.add(Baseline(user_id=1, metric_type=mk, mean=100.0, std=10.0, window_days=30))
+        db.commit()
+
+        import app.engine.loop_runner as lr  # noqa: WPS433
+        monkeypatch.setattr(lr, "METRICS", {mk: object() for mk in metric_keys})
+        monkeypatch.setattr(lr, "filter_insights", lambda xs: xs)
+        monkeypatch.setattr(lr, "apply_escalation_rules", lambda xs: [{**x, "status": "weak_signal"} for x in xs])
+        monkeypatch.setattr(lr, "apply_guardrails", lambda metric_key, values: None)
+        monkeypatch.setattr(
+            lr,
+            "fetch_recent_values_bulk",
+            lambda **kwargs: {mk: [(datetime.utcnow(), 1)] * 7 for mk in kwargs["metric_keys"]},
+        )
+        monkeypatch.setattr(lr, "run_safety_gate", lambda **kwargs: None)
+        DummyPolicy = SimpleNamespace(
+            allowed_insights=["change"],
+            change=SimpleNamespace(z_threshold=0.5),
+            trend=None,
+            instability=None,
+        )
+        monkeypatch.setattr(lr, "get_metric_policy", lambda metric_key: DummyPolicy)
+        monkeypatch.setattr(
+            lr,
+            "detect_change",
+            lambda **kwargs: {"metric_key": kwargs.get("metric_key"), "n_points": 7, "window_days": 7, "z_score": 2.0},
+        )
+        monkeypatch.setattr(
+            lr,
+            "make_change_insight_payload",
+            lambda change, expected_days: (
+                "Signal may be present",
+                "This may be worth testing.",
+                0.5,
+                {"z_score": 2.0, "window_days": 7, "n_points": 7},
+            ),
+        )
+
+        res = lr.run_loop(db=db, user_id=1)
+        assert res["created"] == 2
+
+        check = TestingSessionLocal()
+        try:
+            stored = check.query(Insight).filter(Insight.user_id == 1).all()
+            assert len(stored) == 2
+            for ins in stored:
+                meta = json.loads(ins.metadata_json)
+                assert meta["status"] == "weak_signal"
+                assert meta["metric_key"] in metric_keys
+        finally:
+            check.close()
+    finally:
+        db.close()
+
+
+def test_15_domain_status_audit_written_only_on_change(app_and_db, monkeypatch):
+    _, TestingSessionLocal, _ = app_and_db
+    db = TestingSessionLocal()
+    try:
+        from app.domain.models.audit_event import AuditEvent  # noqa: WPS433
+        from app.domain.models.health_data_point import HealthDataPoint  # noqa: WPS433
+
+        import app.engine.loop_runner as lr  # noqa: WPS433
+        monkeypatch.setattr(lr, "METRICS", {})
+        monkeypatch.setattr(lr, "run_safety_gate", lambda **kwargs: None)
+
+        def _status_audits():
+            return db.query(AuditEvent).filter(AuditEvent.entity_type == "domain_status").count()
+
+        lr.run_loop(db=db, user_id=1)
+        lr.run_loop(db=db, user_id=1)
+        assert _status_audits() == 1
+
+        db.add(
+            HealthDataPoint(
+                user_id=1,
+                metric_type="sleep_duration",
+                value=420.0,
+                unit="min",
+                source="manual",
+                timestamp=datetime.utcnow(),
+            )
+        )
+        db.commit()
+        res = lr.run_loop(db=db, user_id=1)
+        assert res["domain_statuses"]["sleep"] == "BASELINE_BUILDING"
+        assert _status_audits() == 2
+    finally:
+        db.close()
+
+
+def test_16_daily_cap_reached_still_creates_guardrail_and_insufficient_data(app_and_db, monkeypatch):
+    _, TestingSessionLocal, _ = app_and_db
+    db = TestingSessionLocal()
+    try:
+        from app.domain.models.insight import Insight  # noqa: WPS433
+        from app.domain.models.baseline import Baseline  # noqa: WPS433
+
+        for mk in ("sleep_duration", "resting_hr", "hrv_rmssd"):
+            db.add(Baseline(user_id=1, metric_type=mk, mean=100.0, std=10.0, window_days=30))
+        for i in range(10):
+            db.add(
+                Insight(
+                    user_id=1,
+                    insight_type="change",
+                    title=f"Earlier {i}",
+                    description="Earlier",
+                    confidence_score=0.9,
+                    generated_at=datetime.utcnow(),
+                    metadata_json=json.dumps({"metric_key": "sleep_duration"}),
+                )
+            )
+        db.commit()
+
+        import app.engine.loop_runner as lr  # noqa: WPS433
+        monkeypatch.setattr(lr, "METRICS", {mk: object() for mk in ("sleep_duration", "resting_hr", "hrv_rmssd")})
+        monkeypatch.setattr(
+            lr,
+            "apply_guardrails",
+            lambda metric_key, values: (
+                {"title": "Health warning", "summary": "Critically low sleep.", "status": "detected", "confidence": 0.9}
+                if metric_key == "sleep_duration"
+                else None
+            ),
+        )
+        # resting_hr has too few points for the change detector; the others have a full week
+        monkeypatch.setattr(
+            lr,
+            "fetch_recent_values_bulk",
+            lambda **kwargs: {
+                mk: [(datetime.utcnow(), 1)] * (2 if mk == "resting_hr" else 7) for mk in kwargs["metric_keys"]
+            },
+        )
+        monkeypatch.setattr(lr, "run_safety_gate", lambda **kwargs: None)
+
+        def _must_not_run(**kwargs):
+            raise AssertionError("detector ran after daily cap was reached")
+
+        for name in ("detect_change", "detect_trend", "detect_instability"):
+            monkeypatch.setattr(lr, name, _must_not_run)
+
+        res = lr.run_loop(db=db, user_id=1)
+        assert res["skipped"] == "daily_cap"
+        # Saved (and cap-suppressed), as they were before the cap short-circuit existed
+        new = db.query(Insight).filter(Insight.user_id == 1, ~Insight.title.like("Earlier%")).all()
+        assert sorted((i.insight_type, i.title) for i in new) == [
+            ("change", "Health warning"),
+            ("insufficient_data", "Insufficient data for resting_hr"),
+        ]
+    finally:
+        db.close()